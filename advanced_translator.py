@@ -19,17 +19,24 @@ Usage:
     python3 advanced_translator.py --report-only       # Generate reports without translation
 """
 
-import os
 import sys
 import json
 import argparse
 import logging
 import re
-import time
+import asyncio
+import hashlib
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Set, Optional
 
+from llm_backend import (AsyncTranslationBackend, SegmentPacker, run_queue, translate_chunked, estimate_tokens,
+                         resolve_api_key, DEFAULT_CONCURRENCY, DEFAULT_MAX_CONCURRENCY, DEFAULT_RPM, DEFAULT_TPM,
+                         DEFAULT_CHUNK_TOKENS)
+from markdown_blocks import tokenize_blocks
+from placeholders import protect, restore
+from script_histogram import script_histogram, strip_non_prose
+
 # Optional AI dependencies
 try:
     import openai
@@ -43,6 +50,17 @@ try:
 except ImportError:
     HAS_FRONTMATTER = False
 
+from response_cache import open_response_cache, cache_report, DEFAULT_MAX_MB as DEFAULT_CACHE_MB
+from translation_memory import open_translation_memory, DEFAULT_FILENAME as TM_FILENAME
+
+# Hybrid routing: local output whose prose is less than this share Arabic
+# (and has at least HYBRID_MIN_LATIN Latin letters left) goes to the LLM
+HYBRID_THRESHOLD = 0.75
+HYBRID_MIN_LATIN = 12
+
+# Most glossary entries injected into one AI prompt
+MAX_GLOSSARY_ENTRIES = 40
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -62,7 +80,18 @@ class AdvancedTranslationManager:
                  target_lang: str = "ar", 
                  ai_enhance: bool = False,
                  priority_only: bool = False,
-                 report_only: bool = False):
+                 report_only: bool = False,
+                 concurrency: int = DEFAULT_CONCURRENCY,
+                 rpm: int = DEFAULT_RPM,
+                 tpm: int = DEFAULT_TPM,
+                 base_url: Optional[str] = None,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 chunk_tokens: int = DEFAULT_CHUNK_TOKENS,
+                 pack: bool = False,
+                 response_cache_mb: int = DEFAULT_CACHE_MB,
+                 hybrid: bool = False,
+                 hybrid_threshold: float = HYBRID_THRESHOLD,
+                 hybrid_min_latin: int = HYBRID_MIN_LATIN):
         
         self.docs_root = Path(docs_root)
         self.content_root = self.docs_root / "content"
@@ -91,7 +120,10 @@ class AdvancedTranslationManager:
             "created_count": 0,
             "enhanced_count": 0,
             "error_count": 0,
-            "coverage_percent": 0.0
+            "coverage_percent": 0.0,
+            "hybrid_segments": 0,
+            "hybrid_routed": 0,
+            "hybrid_tokens_saved": 0
         }
         
         # Configuration
@@ -122,13 +154,27 @@ class AdvancedTranslationManager:
             r".*spec.*\.md$"
         ]
         
-        # AI setup
-        self.openai_client = None
+        # AI setup; the async backend is created for the duration of a run
+        self.api_key = None
+        self.concurrency = max(1, concurrency)
+        self.max_concurrency = max(self.concurrency, max_concurrency)
+        self.rpm = rpm
+        self.tpm = tpm
+        self.base_url = base_url
+        self.chunk_tokens = max(1, chunk_tokens)
+        self.pack = pack
+        self.response_cache_mb = response_cache_mb
+        self.hybrid = hybrid
+        self.hybrid_threshold = hybrid_threshold
+        self.hybrid_min_latin = max(0, hybrid_min_latin)
+        self._local_translator = None
+        self.backend: Optional[AsyncTranslationBackend] = None
+        self.packer: Optional[SegmentPacker] = None
+        self.llm_stats: Dict[str, int] = {}
         if ai_enhance and HAS_OPENAI:
-            api_key = os.getenv('OPENAI_API_KEY')
-            if api_key:
-                self.openai_client = openai.OpenAI(api_key=api_key)
-                logger.info("OpenAI client initialized for AI enhancements")
+            self.api_key = resolve_api_key(base_url)
+            if self.api_key:
+                logger.info("OpenAI access configured for AI enhancements")
             else:
                 logger.warning("OPENAI_API_KEY not found - AI enhancements disabled")
                 self.ai_enhance = False
@@ -136,6 +182,21 @@ class AdvancedTranslationManager:
             logger.warning("OpenAI not available - AI enhancements disabled")
             self.ai_enhance = False
         
+        # Model settings; the translation memory version is derived from them
+        self.model = "gpt-4"
+        self.temperature = 0.2
+        self.system_prompt = "You are an expert Arabic translator specializing in technical documentation for software development. Translate accurately while preserving all formatting."
+        self._knowledge_base = None
+        self.tm_version = None
+        self.translation_memory = None
+        if self.ai_enhance:
+            # Built here so runs without --ai-enhance never load the knowledge base;
+            # prompts carry glossary entries, so a glossary change is a new version
+            self.tm_version = f"{self.model}:{self.temperature}:" + hashlib.sha1(
+                (self.system_prompt + self._build_ai_prompt("{text}", "{context}")).encode("utf-8")).hexdigest()[:12]
+            self.tm_version += f":{self.knowledge_base.version}"
+            self.translation_memory = open_translation_memory(self.docs_root / TM_FILENAME)
+        
         # Arabic translations dictionary
         self.arabic_translations = {
             # Common GitHub terms
@@ -295,20 +356,30 @@ class AdvancedTranslationManager:
     
     def translate_text_basic(self, text: str) -> str:
         """Basic translation using dictionary"""
-        translated = text
+        # Keep liquid, code, URLs and HTML out of the dictionary pass
+        translated, preserved = protect(text)
         for english, arabic in self.arabic_translations.items():
             # Use word boundaries to avoid partial matches
             pattern = r'\b' + re.escape(english) + r'\b'
             translated = re.sub(pattern, arabic, translated, flags=re.IGNORECASE)
-        return translated
+        return restore(translated, preserved)
     
-    def translate_text_ai(self, text: str, context: str = "") -> str:
-        """AI-powered translation using OpenAI"""
-        if not self.openai_client:
-            return self.translate_text_basic(text)
+    @property
+    def knowledge_base(self):
+        """Shared terminology database of the local engine, loaded on first use"""
+        if self._knowledge_base is None:
+            from local_ai_translator import get_knowledge_base
+            self._knowledge_base = get_knowledge_base()
+        return self._knowledge_base
+    
+    def _build_ai_prompt(self, text: str, context: str) -> str:
+        """Build the user prompt for AI translation
         
-        try:
-            prompt = f"""Translate the following GitHub documentation text from English to Arabic.
+        The guidelines are a fixed prefix shared by every request so that
+        provider-side prompt caching applies; the glossary that follows only
+        holds the terminology entries that occur in this text.
+        """
+        prompt = f"""Translate the following GitHub documentation text from English to Arabic.
 
 IMPORTANT GUIDELINES:
 1. Preserve ALL markdown formatting (headers, links, lists, tables, code blocks)
@@ -317,45 +388,120 @@ IMPORTANT GUIDELINES:
 4. Keep all HTML tags and special formatting exactly as they are
 5. Use Modern Standard Arabic that is clear and professional
 6. Maintain the same paragraph structure and spacing
-7. For GitHub-specific terms, use these translations:
-   - Repository: المستودع
-   - Pull Request: طلب السحب
-   - Issue: القضية
-   - Commit: الالتزام
-   - Branch: الفرع
-   - Merge: الدمج
+7. Translate GitHub-specific terms exactly as given in the glossary, when one follows
 
-Context: {context}
+"""
+        glossary = self.knowledge_base.glossary_for(text, MAX_GLOSSARY_ENTRIES)
+        if glossary:
+            prompt += "Glossary:\n" + "\n".join(f"- {term}: {arabic}" for term, arabic in glossary) + "\n\n"
+        return prompt + f"""Context: {context}
 
 Text to translate:
 {text}
 
 Arabic translation:"""
-
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert Arabic translator specializing in technical documentation for software development. Translate accurately while preserving all formatting."
-                    },
-                    {
-                        "role": "user", 
-                        "content": prompt
-                    }
-                ],
-                temperature=0.2,
-                max_tokens=4000
-            )
-            
-            translation = response.choices[0].message.content.strip()
-            return translation
-            
+    
+    async def _request_translation_ai(self, text: str, context: str) -> str:
+        """Translation memory lookup, then one API request; errors propagate"""
+        tm = self.translation_memory
+        if tm is not None:
+            remembered = tm.lookup("openai:advanced_translator", self.tm_version, text)
+            if remembered is not None:
+                return remembered
+        
+        if self.packer is not None and self.packer.accepts(text):
+            translation = await self.packer.translate(text, context)
+        else:
+            translation = await self.backend.complete(self._build_ai_prompt(text, context))
+        if tm is not None:
+            tm.store("openai:advanced_translator", self.tm_version, text, translation, durable=True)
+        return translation
+    
+    async def translate_text_ai(self, text: str, context: str = "") -> str:
+        """AI-powered translation using OpenAI"""
+        if self.backend is None:
+            return self.translate_text_basic(text)
+        
+        try:
+            return await self._request_translation_ai(text, context)
         except Exception as e:
             logger.error(f"AI translation error: {e}")
             return self.translate_text_basic(text)
     
-    def create_arabic_content(self, english_file: Path) -> str:
+    async def translate_body_ai(self, text: str, context: str = "") -> str:
+        """AI translation of a page body in token-budgeted chunks; failed chunks fall back to basic"""
+        if self.backend is None:
+            return self.translate_text_basic(text)
+        
+        async def translate_chunk(chunk: str, part: str) -> str:
+            return await self._request_translation_ai(chunk, f"{context}, {part}" if part else context)
+        
+        return await translate_chunked(text, translate_chunk, max_tokens=self.chunk_tokens,
+                                       fallback=self.translate_text_basic)
+    
+    @property
+    def local_translator(self):
+        """Local engine used by hybrid mode, built on first use"""
+        if self._local_translator is None:
+            from local_ai_translator import LocalAITranslator
+            self._local_translator = LocalAITranslator(docs_root=str(self.docs_root.resolve()))
+        return self._local_translator
+    
+    def _needs_llm(self, local_output: str) -> bool:
+        """True when the local engine left too much English in a segment"""
+        histogram = script_histogram(strip_non_prose(local_output))
+        return histogram.latin >= self.hybrid_min_latin and histogram.arabic_ratio < self.hybrid_threshold
+    
+    async def translate_segments_hybrid(self, segments: List[str], context: str = "") -> List[str]:
+        """Local engine first; only low-confidence segments are sent to the LLM
+        
+        A routed segment whose request fails keeps its local translation.
+        """
+        results = self.local_translator.translate_batch(segments)
+        routed = {}
+        kept_local = set()
+        for segment, local_output in zip(segments, results):
+            if segment in routed or segment in kept_local:
+                continue
+            if self._needs_llm(local_output):
+                routed[segment] = local_output
+            else:
+                # Tokens the (deduplicated) request would have cost: input plus ~2x Arabic output
+                kept_local.add(segment)
+                self.stats["hybrid_tokens_saved"] += 3 * estimate_tokens(segment)
+        self.stats["hybrid_segments"] += len(segments)
+        self.stats["hybrid_routed"] += sum(1 for segment in segments if segment in routed)
+        
+        if routed and self.backend is not None:
+            async def route(segment: str) -> str:
+                try:
+                    return await self._request_translation_ai(segment, context)
+                except Exception as e:
+                    logger.debug(f"Hybrid request failed, keeping local translation: {e}")
+                    return routed[segment]
+            
+            answers = await asyncio.gather(*(route(segment) for segment in routed))
+            routed = dict(zip(routed, answers))
+        return [routed.get(segment, local_output) for segment, local_output in zip(segments, results)]
+    
+    async def translate_text_hybrid(self, text: str, context: str = "") -> str:
+        return (await self.translate_segments_hybrid([text], context))[0]
+    
+    async def translate_body_hybrid(self, text: str, context: str = "") -> str:
+        """Hybrid translation of a page body, segment by segment within its Markdown blocks"""
+        blocks = tokenize_blocks(text)
+        segments = [segment for block in blocks for segment in block.segments(text)]
+        translations = iter(await self.translate_segments_hybrid(segments, context))
+        out = []
+        pos = 0
+        for block in blocks:
+            out.append(text[pos:block.start])
+            out.append(block.render(text, lambda _: next(translations)))
+            pos = block.end
+        out.append(text[pos:])
+        return "".join(out)
+    
+    async def create_arabic_content(self, english_file: Path) -> str:
         """Create Arabic content from English file"""
         try:
             with open(english_file, 'r', encoding='utf-8') as f:
@@ -367,23 +513,31 @@ Arabic translation:"""
             arabic_fm = frontmatter.copy()
             translatable_fields = ['title', 'shortTitle', 'intro', 'permissions']
             
-            for field in translatable_fields:
-                if field in arabic_fm and arabic_fm[field]:
-                    if self.ai_enhance:
-                        arabic_fm[field] = self.translate_text_ai(
-                            arabic_fm[field], 
-                            f"frontmatter {field} for {english_file.name}"
-                        )
-                    else:
-                        arabic_fm[field] = self.translate_text_basic(arabic_fm[field])
+            fields = [field for field in translatable_fields if field in arabic_fm and arabic_fm[field]]
+            
+            if self.ai_enhance:
+                # Frontmatter fields and the body are independent requests; send them together
+                translate_field = self.translate_text_hybrid if self.hybrid else self.translate_text_ai
+                translate_body = self.translate_body_hybrid if self.hybrid else self.translate_body_ai
+                requests = [
+                    translate_field(arabic_fm[field], f"frontmatter {field} for {english_file.name}")
+                    for field in fields
+                ]
+                if content.strip():
+                    requests.append(translate_body(
+                        content,
+                        f"GitHub documentation file: {english_file.relative_to(self.content_root)}"
+                    ))
+                results = await asyncio.gather(*requests)
+                arabic_fm.update(zip(fields, results))
+            else:
+                for field in fields:
+                    arabic_fm[field] = self.translate_text_basic(arabic_fm[field])
             
             # Create Arabic content
             if self.ai_enhance and content.strip():
                 # AI translation for full content
-                arabic_content = self.translate_text_ai(
-                    content,
-                    f"GitHub documentation file: {english_file.relative_to(self.content_root)}"
-                )
+                arabic_content = results[-1]
             else:
                 # Basic placeholder with note
                 arabic_content = f"""# {arabic_fm.get('title', 'صفحة غير مترجمة')}
@@ -435,23 +589,45 @@ Arabic translation:"""
         # Sort by priority and size
         files_to_translate.sort(key=lambda f: (not self.is_priority_file(f), f.stat().st_size))
         
-        created_count = 0
-        enhanced_count = 0
-        
         logger.info(f"Starting translation of {len(files_to_translate)} files...")
         
-        for i, english_file in enumerate(files_to_translate, 1):
+        # Files run concurrently; pacing comes from the backend's rate limits
+        try:
+            created_count, enhanced_count = asyncio.run(self._create_translations_async(files_to_translate))
+        except KeyboardInterrupt:
+            logger.info("Translation interrupted by user")
+            created_count = enhanced_count = 0
+        
+        self.stats["created_count"] = created_count
+        self.stats["enhanced_count"] = enhanced_count
+        self.stats["translation_end_time"] = datetime.now()
+        
+        translation_time = (self.stats["translation_end_time"] - self.stats["translation_start_time"]).total_seconds()
+        
+        logger.info(f"Translation completed in {translation_time:.1f} seconds")
+        logger.info(f"Successfully created {created_count} translation files")
+        if self.ai_enhance:
+            logger.info(f"AI-enhanced translations: {enhanced_count}")
+    
+    async def _create_translations_async(self, files_to_translate: List[Path]) -> tuple:
+        """Translate files through a bounded queue and one shared, rate-limited backend"""
+        counts = {"created": 0, "enhanced": 0, "scheduled": 0}
+        total = len(files_to_translate)
+        
+        async def translate_one(english_file: Path) -> None:
+            counts["scheduled"] += 1
+            i = counts["scheduled"]
             try:
                 arabic_file = self.get_arabic_file_path(english_file)
                 
                 # Skip if already exists
                 if arabic_file.exists():
-                    continue
+                    return
                 
                 # Create Arabic content
-                arabic_content = self.create_arabic_content(english_file)
+                arabic_content = await self.create_arabic_content(english_file)
                 if arabic_content is None:
-                    continue
+                    return
                 
                 # Ensure directory exists
                 arabic_file.parent.mkdir(parents=True, exist_ok=True)
@@ -460,35 +636,51 @@ Arabic translation:"""
                 with open(arabic_file, 'w', encoding='utf-8') as f:
                     f.write(arabic_content)
                 
-                created_count += 1
+                counts["created"] += 1
                 if self.ai_enhance:
-                    enhanced_count += 1
+                    counts["enhanced"] += 1
                 
                 rel_path = english_file.relative_to(self.content_root)
                 priority_mark = " [PRIORITY]" if self.is_priority_file(english_file) else ""
                 ai_mark = " [AI]" if self.ai_enhance else ""
                 
                 if i % 100 == 0 or self.is_priority_file(english_file):
-                    logger.info(f"[{i}/{len(files_to_translate)}] Created: {rel_path}{priority_mark}{ai_mark}")
-                
-                # Rate limiting for AI
-                if self.ai_enhance and self.openai_client:
-                    time.sleep(0.5)
+                    logger.info(f"[{i}/{total}] Created: {rel_path}{priority_mark}{ai_mark}")
                 
             except Exception as e:
                 logger.error(f"Error translating {english_file}: {e}")
                 self.stats["error_count"] += 1
         
-        self.stats["created_count"] = created_count
-        self.stats["enhanced_count"] = enhanced_count
-        self.stats["translation_end_time"] = datetime.now()
-        
-        translation_time = (self.stats["translation_end_time"] - self.stats["translation_start_time"]).total_seconds()
-        
-        logger.info(f"Translation completed in {translation_time:.1f} seconds")
-        logger.info(f"Successfully created {created_count} translation files")
-        if self.ai_enhance:
-            logger.info(f"AI-enhanced translations: {enhanced_count}")
+        if self.ai_enhance and self.api_key:
+            self.backend = AsyncTranslationBackend(
+                model=self.model,
+                temperature=self.temperature,
+                system_prompt=self.system_prompt,
+                concurrency=self.concurrency,
+                max_concurrency=self.max_concurrency,
+                rpm=self.rpm,
+                tpm=self.tpm,
+                base_url=self.base_url,
+                api_key=self.api_key,
+                cache=open_response_cache(self.docs_root, self.response_cache_mb),
+            )
+            if self.pack:
+                self.packer = SegmentPacker(self.backend, self._build_ai_prompt)
+        try:
+            # Enough workers to reach the ceiling; the backend's adaptive limit gates actual requests
+            workers = self.max_concurrency if self.backend is not None else 1
+            await run_queue(files_to_translate, translate_one, workers=workers)
+        finally:
+            if self.backend is not None:
+                self.llm_stats = {**self.backend.stats, **self.backend.concurrency_stats,
+                                  **cache_report(self.backend.cache)}
+                if self.packer is not None:
+                    self.llm_stats.update(self.packer.stats)
+                    self.packer = None
+                await self.backend.aclose()
+                self.backend = None
+        
+        return counts["created"], counts["enhanced"]
     
     def generate_comprehensive_report(self) -> str:
         """Generate detailed analysis report"""
@@ -514,6 +706,28 @@ Arabic translation:"""
         report_lines.append(f"Files Created This Run: {self.stats['created_count']:,}")
         if self.ai_enhance:
             report_lines.append(f"AI-Enhanced Files: {self.stats['enhanced_count']:,}")
+        if self.translation_memory is not None:
+            tm_stats = self.translation_memory.stats
+            report_lines.append(f"Translation Memory Hits: {tm_stats['hits']:,} ({self.translation_memory.hit_rate():.1f}%)")
+        if self.llm_stats:
+            total_tokens = self.llm_stats['prompt_tokens'] + self.llm_stats['completion_tokens']
+            report_lines.append(f"API Requests: {self.llm_stats['requests']:,} ({total_tokens:,} tokens)")
+            report_lines.append(f"Throttled Responses: {self.llm_stats['throttled']:,} "
+                                f"(concurrency limit {self.llm_stats['concurrency_limit']}, "
+                                f"peak {self.llm_stats['peak_concurrency']})")
+            if 'cache_hits' in self.llm_stats:
+                lookups = self.llm_stats['cache_hits'] + self.llm_stats['cache_misses']
+                hit_rate = self.llm_stats['cache_hits'] / lookups * 100 if lookups else 0.0
+                report_lines.append(f"Response Cache Hits: {self.llm_stats['cache_hits']:,} ({hit_rate:.1f}%)")
+            if self.pack:
+                report_lines.append(f"Packed Requests: {self.llm_stats['packed_requests']:,} "
+                                    f"({self.llm_stats['packed_segments']:,} segments, "
+                                    f"{self.llm_stats['pack_fallbacks']:,} re-sent individually)")
+        if self.hybrid and self.stats["hybrid_segments"]:
+            routed_percent = self.stats["hybrid_routed"] / self.stats["hybrid_segments"] * 100
+            report_lines.append(f"Hybrid Routing: {self.stats['hybrid_routed']:,} of {self.stats['hybrid_segments']:,} "
+                                f"segments sent to the LLM ({routed_percent:.1f}%)")
+            report_lines.append(f"Estimated Tokens Saved: ~{self.stats['hybrid_tokens_saved']:,}")
         report_lines.append(f"Errors Encountered: {self.stats['error_count']:,}")
         report_lines.append("")
         
@@ -616,6 +830,7 @@ Arabic translation:"""
                 "docs_root": str(self.docs_root),
                 "target_language": self.target_lang,
                 "ai_enhance": self.ai_enhance,
+                "hybrid": self.hybrid,
                 "priority_only": self.priority_only,
                 "report_only": self.report_only
             },
@@ -685,6 +900,7 @@ Examples:
   python3 advanced_translator.py --priority-only      # Focus on high-priority files
   python3 advanced_translator.py --report-only        # Generate reports only
   python3 advanced_translator.py --ai-enhance --priority-only  # AI for priority files only
+  python3 advanced_translator.py --ai-enhance --hybrid  # Local engine first, AI only where it falls short
         """
     )
     
@@ -693,6 +909,28 @@ Examples:
     parser.add_argument('--ai-enhance', action='store_true', help='Use AI for translation (requires OpenAI API key)')
     parser.add_argument('--priority-only', action='store_true', help='Only translate high-priority files')
     parser.add_argument('--report-only', action='store_true', help='Generate reports without creating translations')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help='Initial API requests in flight; adapts to throttling')
+    parser.add_argument('--max-concurrency', type=int, default=DEFAULT_MAX_CONCURRENCY,
+                        help='Ceiling for the adaptive in-flight limit')
+    parser.add_argument('--chunk-tokens', type=int, default=DEFAULT_CHUNK_TOKENS,
+                        help='Approximate token budget per AI request for long pages')
+    parser.add_argument('--pack', action='store_true',
+                        help='Pack short AI requests from several files into one API call')
+    parser.add_argument('--response-cache-mb', type=int, default=DEFAULT_CACHE_MB,
+                        help='Size limit of the on-disk API response cache in MB, 0 to disable')
+    parser.add_argument('--rpm', type=int, default=DEFAULT_RPM, help='API requests per minute limit')
+    parser.add_argument('--tpm', type=int, default=DEFAULT_TPM, help='API tokens per minute limit')
+    parser.add_argument('--base-url', help='OpenAI-compatible API base URL, e.g. a local mock server '
+                        '(OPENAI_API_KEY is optional with it)')
+    parser.add_argument('--hybrid', action='store_true',
+                        help='With --ai-enhance: translate locally first and send only low-confidence segments to the AI')
+    parser.add_argument('--hybrid-threshold', type=float, default=HYBRID_THRESHOLD,
+                        help=f'Arabic share below which a locally translated segment is routed to the AI '
+                             f'(default: {HYBRID_THRESHOLD})')
+    parser.add_argument('--hybrid-min-latin', type=int, default=HYBRID_MIN_LATIN,
+                        help=f'Latin letters a locally translated segment must still contain to be routed to the AI '
+                             f'(default: {HYBRID_MIN_LATIN})')
     parser.add_argument('--verbose', action='store_true', help='Enable verbose logging')
     
     args = parser.parse_args()
@@ -700,13 +938,16 @@ Examples:
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
     
+    if args.hybrid and not args.ai_enhance:
+        parser.error("--hybrid requires --ai-enhance")
+    
     # Check dependencies
     if args.ai_enhance:
         if not HAS_OPENAI:
             print("Error: OpenAI library not installed. Run: pip install openai")
             return 1
-        if not os.getenv('OPENAI_API_KEY'):
-            print("Error: OPENAI_API_KEY environment variable not set")
+        if not resolve_api_key(args.base_url):
+            print("Error: OPENAI_API_KEY environment variable not set (not needed with --base-url)")
             return 1
     
     # Initialize and run
@@ -715,7 +956,18 @@ Examples:
         target_lang=args.target_lang,
         ai_enhance=args.ai_enhance,
         priority_only=args.priority_only,
-        report_only=args.report_only
+        report_only=args.report_only,
+        concurrency=args.concurrency,
+        rpm=args.rpm,
+        tpm=args.tpm,
+        base_url=args.base_url,
+        max_concurrency=args.max_concurrency,
+        chunk_tokens=args.chunk_tokens,
+        pack=args.pack,
+        response_cache_mb=args.response_cache_mb,
+        hybrid=args.hybrid,
+        hybrid_threshold=args.hybrid_threshold,
+        hybrid_min_latin=args.hybrid_min_latin
     )
     
     try:
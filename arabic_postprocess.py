@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Arabic Post-Processing Pipeline
+
+Final clean-up applied to translated output by both the CLI translator and
+the web app:
+
+- Typography: Arabic-Indic digits and Arabic punctuation (، ؛ ؟) with
+  normalized spacing, applied only to lines that contain Arabic. Leading
+  indentation and list/quote markers are kept so Markdown structure survives,
+  and placeholder tokens from placeholders.protect() are skipped, so inline
+  code, link targets, URLs and HTML masked before typography come back
+  byte-identical.
+- Arabic-only cleanup: drops code, liquid, URLs, e-mail addresses, HTML and
+  Latin text, keeping only lines that still contain Arabic.
+
+All patterns are compiled once, removals are merged into a single
+alternation, and line-level rules run in one sweep. ArabicPostProcessor
+applies the same rules as a streaming filter over chunks, tracking fenced
+code blocks across chunk boundaries.
+
+Usage:
+    from arabic_postprocess import ArabicPostProcessor, arabic_typography
+
+    processor = ArabicPostProcessor(arabic_only=False)
+    for chunk in chunks:
+        out.write(processor.feed(chunk))
+    out.write(processor.flush())
+"""
+
+import re
+from typing import Iterable, Iterator
+
+from placeholders import PLACEHOLDER_RE, protect, restore
+
+ARABIC_CHAR = re.compile(r"[\u0600-\u06FF]")
+
+# Leading indentation plus an optional list or quote marker, e.g. "   2. " or "  - "
+LINE_PREFIX = re.compile(r"[ \t]*(?:(?:\d{1,9}[.)]|[-*+>])[ \t]+)?")
+FENCE = re.compile(r"[ \t]*(`{3,}|~{3,})")
+
+# Digits and punctuation converted in one str.translate
+TYPOGRAPHY_TABLE = str.maketrans("0123456789?;,", "٠١٢٣٤٥٦٧٨٩؟؛،")
+INLINE_WS = re.compile(r"[ \t]+")
+SPACE_BEFORE_PUNCT = re.compile(r"[ \t]+(?=[،؛])")
+# No space is added between digits, so thousands separators (١،٠٠٠) stay intact
+MISSING_SPACE_AFTER_PUNCT = re.compile(r"([،؛])(?!$|[\s،؛]|(?<=[\d٠-٩][،؛])[\d٠-٩])")
+
+# Markdown links keep only their text in Arabic-only output
+MARKDOWN_LINK = re.compile(r"\[([^\]\n]*)\]\([^)\n]*\)")
+
+# Everything Arabic-only output drops, in one alternation
+NON_ARABIC_SPANS = re.compile(
+    r"```[\s\S]*?```"
+    r"|`[^`\n]*`"
+    r"|{%[^%]*%}|{{[^}]*}}"
+    r"|https?://\S+|www\.\S+"
+    r"|\b[\w.-]+@[\w.-]+\.[A-Za-z]{2,}\b"
+    r"|<[^>\n]+>"
+    r"|[A-Za-z]+"
+)
+EMPTY_BRACKETS = re.compile(r"\(\s*\)|\[\s*\]|\{\s*\}")
+
+
+def _typography_chars(text: str) -> str:
+    """Convert digits and punctuation everywhere except inside placeholder tokens"""
+    if "__PRESERVE_" not in text:
+        return text.translate(TYPOGRAPHY_TABLE)
+    out = []
+    pos = 0
+    for m in PLACEHOLDER_RE.finditer(text):
+        out.append(text[pos:m.start()].translate(TYPOGRAPHY_TABLE))
+        out.append(m.group(0))
+        pos = m.end()
+    out.append(text[pos:].translate(TYPOGRAPHY_TABLE))
+    return "".join(out)
+
+
+def typography_line(line: str) -> str:
+    """Arabic typography for one (masked) line; lines without Arabic are returned unchanged"""
+    if not ARABIC_CHAR.search(line):
+        return line
+    keep = LINE_PREFIX.match(line).end()
+    body = _typography_chars(line[keep:])
+    if "  " in body or "\t" in body:
+        body = INLINE_WS.sub(" ", body)
+    if "،" in body or "؛" in body:
+        body = MISSING_SPACE_AFTER_PUNCT.sub(r"\1 ", SPACE_BEFORE_PUNCT.sub("", body))
+    return line[:keep] + body
+
+
+def arabic_typography(text: str) -> str:
+    """Apply typography to every Arabic line of already masked text (see placeholders.protect)"""
+    return "\n".join([typography_line(line) for line in text.split("\n")])
+
+
+def _arabic_only_line(line: str) -> str:
+    """Arabic-only form of one line after span removal; empty if nothing Arabic is left"""
+    if not ARABIC_CHAR.search(line):
+        return ""
+    line = EMPTY_BRACKETS.sub(" ", line)
+    return typography_line(INLINE_WS.sub(" ", line).strip())
+
+
+def _strip_non_arabic(text: str) -> str:
+    if "](" in text:
+        text = MARKDOWN_LINK.sub(r"\1", text)
+    return NON_ARABIC_SPANS.sub(lambda m: "\n" if m.group(0).startswith("```") else " ", text)
+
+
+def protected_typography_line(line: str) -> str:
+    """Typography for one unmasked line, keeping code, link targets, URLs and HTML intact"""
+    if not ARABIC_CHAR.search(line):
+        return line
+    masked, originals = protect(line)
+    return restore(typography_line(masked), originals)
+
+
+def arabic_only_cleanup(text: str) -> str:
+    """Strip everything but Arabic prose; returns the kept lines joined by newlines"""
+    cleaned = _strip_non_arabic(text)
+    kept = [line for line in map(_arabic_only_line, cleaned.split("\n")) if line]
+    return "\n".join(kept)
+
+
+class ArabicPostProcessor:
+    """Streaming post-processing filter: feed() chunks, then flush()
+
+    Only complete lines are processed, so output is identical however the
+    input is chunked. Fenced code blocks are passed through untouched in
+    typography mode and dropped in Arabic-only mode; on other lines inline
+    code, link targets, URLs and HTML are masked before typography.
+    """
+
+    def __init__(self, arabic_only: bool = False):
+        self.arabic_only = arabic_only
+        self._pending = ""
+        self._fence = ""  # opening marker of the fenced block we are inside
+
+    def _process_line(self, line: str) -> str:
+        fence = FENCE.match(line)
+        if self._fence:
+            if fence and fence.group(1)[0] == self._fence[0] and len(fence.group(1)) >= len(self._fence) \
+                    and not line.strip().lstrip(self._fence[0]):
+                self._fence = ""
+            return "" if self.arabic_only else line + "\n"
+        if fence:
+            self._fence = fence.group(1)
+            return "" if self.arabic_only else line + "\n"
+
+        if not self.arabic_only:
+            return protected_typography_line(line) + "\n"
+        line = _arabic_only_line(_strip_non_arabic(line))
+        return line + "\n" if line else ""
+
+    def feed(self, chunk: str) -> str:
+        """Add a chunk; returns the processed text for every completed line"""
+        self._pending += chunk
+        cut = self._pending.rfind("\n")
+        if cut < 0:
+            return ""
+        lines = self._pending[:cut].split("\n")
+        self._pending = self._pending[cut + 1:]
+        return "".join([self._process_line(line) for line in lines])
+
+    def flush(self) -> str:
+        """Process the final, unterminated line (if any)"""
+        if not self._pending:
+            return ""
+        out = self._process_line(self._pending)
+        self._pending = ""
+        # The last line had no newline in the input
+        return out[:-1] if out.endswith("\n") else out
+
+    def stream(self, chunks: Iterable[str]) -> Iterator[str]:
+        for chunk in chunks:
+            out = self.feed(chunk)
+            if out:
+                yield out
+        tail = self.flush()
+        if tail:
+            yield tail
+
+    def process(self, text: str) -> str:
+        return self.feed(text) + self.flush()
@@ -4,24 +4,18 @@ import re
 from pathlib import Path
 from collections import Counter, defaultdict
 
+from script_histogram import likely_english_batch
+
 ROOT = Path(__file__).resolve().parent
 CONTENT_DIR = ROOT / "docs" / "content"
 
-ENGLISH_CUES = [
-    r"\bPrerequisites\b", r"\bOverview\b", r"\bSummary\b", r"\bSteps\b",
-    r"\bNote:\b", r"\bTip:\b", r"\bCaution:\b", r"\bWarning:\b",
-    r"\bAbout GitHub\b", r"\bGitHub Actions\b", r"\bThis guide\b",
-    r"\bYou can\b", r"\bTo [a-z]+:\b", r"\bExample\b", r"\bLearn more\b",
-]
-EN_PATTERN = re.compile("|".join(ENGLISH_CUES))
-CODE_BLOCK = re.compile(r"```[\s\S]*?```", re.MULTILINE)
-INLINE_CODE = re.compile(r"`[^`]+`")
-LIQUID = re.compile(r"({%[^%]*%}|{{[^}]*}})")
-URLS = re.compile(r"https?://[^\s)]+")
 AR_CHARS = re.compile(r"[\u0600-\u06FF]")
 
 SKIP_DIRS = {"assets", "images", "_snippets"}
 
+# Arabic files scored per histogram batch
+SCORE_BATCH_SIZE = 500
+
 
 def is_markdown(p: Path) -> bool:
     return p.suffix.lower() == ".md"
@@ -47,31 +41,6 @@ def has_arabic(text: str) -> bool:
     return bool(AR_CHARS.search(text))
 
 
-def _strip_non_prose(text: str) -> str:
-    text = CODE_BLOCK.sub("", text)
-    text = INLINE_CODE.sub("", text)
-    text = LIQUID.sub("", text)
-    text = URLS.sub("", text)
-    return text
-
-def _arabic_ratio(text: str) -> float:
-    letters = re.findall(r"[A-Za-z\u0600-\u06FF]", text)
-    if not letters:
-        return 1.0
-    arabic = re.findall(r"[\u0600-\u06FF]", text)
-    return len(arabic) / len(letters)
-
-def likely_english(text: str) -> bool:
-    cleaned = _strip_non_prose(text)
-    ratio = _arabic_ratio(cleaned)
-    ascii_letters = len(re.findall(r"[A-Za-z]", cleaned))
-    # Gate obvious English sections with cues but avoid counting mostly Arabic text
-    if EN_PATTERN.search(cleaned) and ratio < 0.5:
-        return True
-    # Stricter heuristic
-    return ascii_letters > 150 and ratio < 0.15
-
-
 def main():
     en_files = []
     ar_files = []
@@ -90,6 +59,12 @@ def main():
     missing_ar = []
     english_leakage = []
     ar_leakage = []
+    batch = []  # (path, text) scored together for English leakage
+
+    def score_batch():
+        flags = likely_english_batch([txt for _, txt in batch])
+        english_leakage.extend(rel(ar) for (ar, _), flagged in zip(batch, flags) if flagged)
+        batch.clear()
 
     for key, pair in pairs.items():
         en = pair.get("en")
@@ -101,11 +76,13 @@ def main():
                 txt = ar.read_text(encoding="utf-8", errors="ignore")
             except Exception:
                 txt = ""
-            if likely_english(txt):
-                english_leakage.append(rel(ar))
+            batch.append((ar, txt))
+            if len(batch) >= SCORE_BATCH_SIZE:
+                score_batch()
             # Check if trivially short or placeholder
             if len(txt.strip()) < 120 or "هذه الصفحة تحتاج" in txt or "> **ملاحظة**" in txt:
                 ar_leakage.append(rel(ar))
+    score_batch()
 
     total_en = len(en_files)
     total_ar = len(ar_files)
@@ -0,0 +1,789 @@
+#!/usr/bin/env python3
+"""
+Async LLM Translation Backend
+
+Shared asyncio backend for the OpenAI-powered translators. One pooled
+AsyncOpenAI client serves every request; an adaptive (AIMD) limit bounds
+requests in flight, and token buckets keep the run under the account's
+requests per minute and tokens per minute instead of sleeping a fixed time
+per file.
+
+The in-flight limit grows by one request per window of successful
+responses and is halved on 429s, timeouts and 5xx responses. Throttled
+requests wait out Retry-After (when the server sends one) and are retried,
+so the run settles at whatever the key's current quota allows.
+
+Transient failures (throttling, timeouts, 5xx, connection errors) are
+retried with jittered exponential backoff. A circuit breaker opens after
+several consecutive outage-type failures and holds every request until a
+single probe gets through, so a backend outage pauses the run instead of
+failing file after file. A request that still fails raises TranslationError;
+callers must not write anything for it.
+
+With an on_delta callback, complete() streams the response (stream=True)
+and hands over text as it arrives; translate_chunked() can route those
+deltas into an OrderedChunkWriter, which writes the page to disk in order
+while later chunks are still streaming.
+run_queue() feeds work items through a bounded asyncio.Queue so the file
+loop never gets far ahead of the API, and translate_chunked() splits long
+page bodies into block-aligned chunks that are translated concurrently.
+SegmentPacker goes the other way for short text: frontmatter fields and
+small pages from different files are packed into one request as ID-tagged
+sections, so they share the system prompt and request overhead.
+
+The base URL is configurable (--base-url or OPENAI_BASE_URL), so the whole
+pipeline can be exercised against a local mock server; with a custom base
+URL and no OPENAI_API_KEY, a placeholder key is sent (see resolve_api_key).
+
+Usage:
+    backend = AsyncTranslationBackend(model="gpt-4", temperature=0.3, system_prompt=SYSTEM,
+                                      concurrency=8, max_concurrency=64, rpm=500, tpm=150000)
+    arabic = await backend.complete(prompt)
+    await backend.aclose()
+"""
+
+import os
+import re
+import time
+import random
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from markdown_blocks import chunk_markdown
+from response_cache import ResponseCache
+
+# Optional OpenAI client
+try:
+    import openai
+    HAS_OPENAI = True
+except ImportError:
+    HAS_OPENAI = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_MAX_CONCURRENCY = 64
+DEFAULT_RPM = 500
+DEFAULT_TPM = 150_000
+DEFAULT_MAX_RETRIES = 5
+
+# Input budget per chunk: Arabic output runs ~2x the English tokens, which must fit max_tokens
+DEFAULT_CHUNK_TOKENS = 1500
+DEFAULT_CHUNK_RETRIES = 2
+
+# Request packing: total input budget, sections per request, largest packable
+# segment, and how long a partial pack waits for more segments
+DEFAULT_PACK_TOKENS = 1500
+DEFAULT_PACK_SEGMENTS = 20
+PACK_SEGMENT_TOKENS = 400
+DEFAULT_PACK_LINGER = 0.05
+
+PACK_CONTEXT = (
+    "The text contains several independent sections. Each starts with a line [[SEG n]] "
+    "(optionally followed by that section's context) and ends with a line [[END n]]. "
+    "Translate every section separately and return each one between the same [[SEG n]] "
+    "and [[END n]] lines, keeping the numbers; output nothing outside the markers"
+)
+PACKED_SECTION = re.compile(r"\[\[SEG (\d+)\]\][^\n]*\n(.*?)\n?[ \t]*\[\[END \1\]\]", re.DOTALL)
+
+# Retry backoff: base * 2**attempt seconds, capped, with jitter
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 60.0
+
+# Circuit breaker: consecutive outage failures before opening, and its pause
+BREAKER_THRESHOLD = 5
+BREAKER_COOLDOWN = 30.0
+BREAKER_MAX_COOLDOWN = 600.0
+
+# Multiplicative decrease factor and wait used when a throttle has no Retry-After
+DECREASE_FACTOR = 0.5
+DEFAULT_THROTTLE_WAIT = 2.0
+MAX_THROTTLE_WAIT = 60.0
+
+# Sent when a custom base URL is set without OPENAI_API_KEY (mock servers ignore it)
+PLACEHOLDER_API_KEY = "sk-local-placeholder"
+
+
+def resolve_api_key(base_url: Optional[str] = None) -> Optional[str]:
+    """OPENAI_API_KEY, or a placeholder key when a custom base URL is configured"""
+    api_key = os.getenv("OPENAI_API_KEY")
+    if api_key or not (base_url or os.getenv("OPENAI_BASE_URL")):
+        return api_key
+    return PLACEHOLDER_API_KEY
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) used for rate budgeting"""
+    return max(1, len(text) // 4)
+
+
+class TokenBucket:
+    """Asyncio token bucket refilled continuously at a per-minute rate
+
+    acquire() waits until the requested amount is available. settle()
+    corrects an earlier estimate once the real cost is known; the bucket
+    may go negative, which simply delays the next acquire.
+    """
+
+    def __init__(self, per_minute: float):
+        self.rate = per_minute / 60.0
+        self.capacity = float(per_minute)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            self._refill()
+            while self.tokens < amount:
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= amount
+
+    def settle(self, estimated: float, actual: float) -> None:
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + estimated - actual)
+
+
+class TranslationError(RuntimeError):
+    """A translation request failed for good; no output should be written for it"""
+
+
+def backoff_delay(attempt: int, base: float = BACKOFF_BASE, cap: float = BACKOFF_CAP) -> float:
+    """Jittered exponential backoff before retry number `attempt` (1-based)"""
+    delay = min(cap, base * 2 ** (attempt - 1))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def _retry_after(exc: BaseException) -> Optional[float]:
+    """Seconds requested by a Retry-After / retry-after-ms header, if any"""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000.0
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        pass  # HTTP-date form; fall back to the default wait
+    return None
+
+
+def throttle_signal(exc: BaseException) -> bool:
+    """True for errors that mean the backend is overloaded: 429, timeouts and 5xx"""
+    if isinstance(exc, (asyncio.TimeoutError, TimeoutError)):
+        return True
+    if HAS_OPENAI and isinstance(exc, (openai.APITimeoutError, openai.RateLimitError, openai.InternalServerError)):
+        return True
+    status = getattr(exc, "status_code", None)
+    return isinstance(status, int) and (status == 429 or status >= 500)
+
+
+def transient_error(exc: BaseException) -> bool:
+    """Errors worth retrying: throttle signals plus dropped or refused connections"""
+    if throttle_signal(exc) or isinstance(exc, ConnectionError):
+        return True
+    return HAS_OPENAI and isinstance(exc, openai.APIConnectionError)
+
+
+def outage_signal(exc: BaseException) -> bool:
+    """Transient errors that suggest the backend is down rather than just busy (429)"""
+    return transient_error(exc) and getattr(exc, "status_code", None) != 429
+
+
+class CircuitBreaker:
+    """Pauses all requests while the backend is failing
+
+    Closed: requests flow. After `threshold` consecutive outage failures it
+    opens and requests wait for `cooldown` seconds; then one probe request is
+    let through (half-open). A successful probe closes the breaker; a failed
+    one reopens it with the cooldown doubled, up to max_cooldown.
+    """
+
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, cooldown: float = BREAKER_COOLDOWN,
+                 max_cooldown: float = BREAKER_MAX_COOLDOWN):
+        self.threshold = max(1, threshold)
+        self.base_cooldown = cooldown
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.state = "closed"
+        self.failures = 0
+        self.trips = 0
+        self._reopen_at = 0.0  # open: when to probe; half-open: when to give up on the probe
+
+    async def wait(self) -> bool:
+        """Return when a request may be sent; True if the caller is the half-open probe"""
+        while self.state != "closed":
+            delay = self._reopen_at - time.monotonic()
+            if delay <= 0:
+                # Let this caller probe; others keep waiting until it reports
+                self.state = "half_open"
+                self._reopen_at = time.monotonic() + self.cooldown
+                return True
+            await asyncio.sleep(min(delay, 1.0) if self.state == "half_open" else delay)
+        return False
+
+    def abandon_probe(self) -> None:
+        """The probe was cancelled without an outcome; let the next waiter probe now"""
+        if self.state == "half_open":
+            self._reopen_at = time.monotonic()
+
+    def record(self, outage: bool) -> None:
+        if not outage:
+            if self.state != "closed":
+                logger.info("Backend recovered; resuming requests")
+            self.state = "closed"
+            self.failures = 0
+            self.cooldown = self.base_cooldown
+            return
+        self.failures += 1
+        if self.state == "half_open":
+            self.cooldown = min(self.max_cooldown, self.cooldown * 2)
+            self._open()
+        elif self.state == "closed" and self.failures >= self.threshold:
+            self.trips += 1
+            self._open()
+
+    def _open(self) -> None:
+        self.state = "open"
+        self._reopen_at = time.monotonic() + self.cooldown
+        logger.warning(f"Backend unavailable after {self.failures} consecutive failures; "
+                       f"pausing requests for {self.cooldown:.0f}s")
+
+
+class AdaptiveLimiter:
+    """AIMD limit on requests in flight
+
+    Each success raises the limit by 1/limit (about one extra slot per
+    window of successful requests); a throttle signal multiplies it by
+    DECREASE_FACTOR and pauses new requests for the Retry-After period.
+    Throttles from requests that started before the last decrease are
+    counted but do not cut the limit again, so one burst of 429s halves
+    the limit once rather than collapsing it to the floor.
+    """
+
+    def __init__(self, initial: int, maximum: int, minimum: int = 1):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.peak = self.limit
+        self.in_flight = 0
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        self._cond = asyncio.Condition()
+        self._wakers: set = set()
+
+    async def acquire(self) -> float:
+        """Wait for a free slot; returns the start time to pass to release()"""
+        async with self._cond:
+            while True:
+                pause = self._paused_until - time.monotonic()
+                if pause > 0:
+                    try:
+                        await asyncio.wait_for(self._cond.wait(), timeout=pause)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                if self.in_flight < int(self.limit):
+                    break
+                await self._cond.wait()
+            self.in_flight += 1
+            return time.monotonic()
+
+    def release(self, started: float, throttled: bool = False,
+                retry_after: Optional[float] = None, cancelled: bool = False) -> None:
+        """Free a slot and adjust the limit; cancelled requests leave the limit alone
+
+        Synchronous, so the slot is freed even when called from a task that
+        is being cancelled; waiters are woken by a separate task.
+        """
+        self.in_flight -= 1
+        if cancelled:
+            pass
+        elif throttled:
+            now = time.monotonic()
+            if started >= self._last_decrease:
+                self.limit = max(self.minimum, self.limit * DECREASE_FACTOR)
+                self._last_decrease = now
+                logger.warning(f"Backend throttled; concurrency limit lowered to {int(self.limit)}")
+            wait = retry_after if retry_after is not None else DEFAULT_THROTTLE_WAIT
+            self._paused_until = max(self._paused_until, now + min(wait, MAX_THROTTLE_WAIT))
+        else:
+            self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+            self.peak = max(self.peak, self.limit)
+        waker = asyncio.ensure_future(self._notify())
+        self._wakers.add(waker)
+        waker.add_done_callback(self._wakers.discard)
+
+    async def _notify(self) -> None:
+        async with self._cond:
+            self._cond.notify_all()
+
+
+class _DeltaStripper:
+    """Forwards streamed deltas so their concatenation equals the stripped response
+
+    Leading whitespace is dropped and trailing whitespace is held back until
+    more text follows it.
+    """
+
+    def __init__(self, on_delta: Callable[[str], None]):
+        self.on_delta = on_delta
+        self.parts: List[str] = []
+        self._held = ""
+
+    @property
+    def emitted(self) -> bool:
+        return bool(self.parts)
+
+    def feed(self, delta: str) -> None:
+        text = self._held + delta if self.parts else delta.lstrip()
+        core = text.rstrip()
+        self._held = text[len(core):]
+        if core:
+            self.parts.append(core)
+            self.on_delta(core)
+
+    def text(self) -> str:
+        return "".join(self.parts)
+
+
+class AsyncTranslationBackend:
+    """Rate-limited async chat-completions client shared by all requests of a run"""
+
+    def __init__(self, model: str, temperature: float, system_prompt: str,
+                 concurrency: int = DEFAULT_CONCURRENCY, rpm: int = DEFAULT_RPM, tpm: int = DEFAULT_TPM,
+                 max_tokens: int = 4000, base_url: Optional[str] = None, api_key: Optional[str] = None,
+                 timeout: float = 120.0, client: Any = None,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY, max_retries: int = DEFAULT_MAX_RETRIES,
+                 cache: Optional[ResponseCache] = None):
+        if client is None:
+            if not HAS_OPENAI:
+                raise RuntimeError("OpenAI library not installed. Run: pip install openai")
+            client = openai.AsyncOpenAI(
+                api_key=api_key or resolve_api_key(base_url),
+                base_url=base_url or os.getenv("OPENAI_BASE_URL") or None,
+                timeout=timeout,
+                max_retries=0,  # throttling is handled here so the limiter sees every 429
+            )
+        self.client = client
+        self.model = model
+        self.temperature = temperature
+        self.system_prompt = system_prompt
+        self.max_tokens = max_tokens
+        self.max_retries = max(0, max_retries)
+        self.cache = cache
+        self.limiter = AdaptiveLimiter(concurrency, max(concurrency, max_concurrency))
+        self.breaker = CircuitBreaker()
+        self.request_bucket = TokenBucket(rpm)
+        self.token_bucket = TokenBucket(tpm)
+        self.stats: Dict[str, int] = {"requests": 0, "prompt_tokens": 0, "completion_tokens": 0, "errors": 0,
+                                      "throttled": 0, "retries": 0}
+
+    def _reserve(self, prompt: str) -> int:
+        """Tokens to budget for a request: the prompt plus room for the answer"""
+        prompt_tokens = estimate_tokens(self.system_prompt) + estimate_tokens(prompt)
+        # Arabic output usually needs more tokens than the English it replaces
+        return prompt_tokens + min(self.max_tokens, 2 * estimate_tokens(prompt))
+
+    @property
+    def concurrency_stats(self) -> Dict[str, int]:
+        return {"concurrency_limit": int(self.limiter.limit), "peak_concurrency": int(self.limiter.peak),
+                "breaker_trips": self.breaker.trips}
+
+    def _messages(self, prompt: str) -> List[Dict[str, str]]:
+        return [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "user", "content": prompt},
+        ]
+
+    async def _stream(self, prompt: str, stripper: _DeltaStripper) -> Any:
+        """Consume a streamed completion into stripper; returns the usage, if reported"""
+        stream = await self.client.chat.completions.create(
+            model=self.model,
+            messages=self._messages(prompt),
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        usage = None
+        async for event in stream:
+            if event.choices:
+                delta = event.choices[0].delta.content
+                if delta:
+                    stripper.feed(delta)
+            if getattr(event, "usage", None) is not None:
+                usage = event.usage
+        return usage
+
+    async def complete(self, prompt: str, on_delta: Optional[Callable[[str], None]] = None) -> str:
+        """Send one prompt and return the stripped response text
+
+        Identical requests are answered from the response cache when one is
+        configured. Transient failures (429, timeout, 5xx, connection errors)
+        are retried up to max_retries times with jittered backoff, waiting on
+        the circuit breaker and the limiter's Retry-After pause. Raises
+        TranslationError once the request cannot succeed.
+
+        With on_delta the response is streamed and on_delta receives the
+        text as it arrives (the pieces add up to the return value). A stream
+        that fails after text was delivered is not retried here; the caller
+        has to discard what it received.
+        """
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.key(self.model, self.temperature, self.system_prompt, prompt)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                if on_delta is not None:
+                    on_delta(cached)
+                return cached
+
+        reserved = self._reserve(prompt)
+        attempt = 0
+        while True:
+            probe = await self.breaker.wait()
+            started = await self.limiter.acquire()
+            stripper = _DeltaStripper(on_delta) if on_delta is not None else None
+            try:
+                await self.request_bucket.acquire()
+                await self.token_bucket.acquire(reserved)
+                if stripper is None:
+                    response = await self.client.chat.completions.create(
+                        model=self.model,
+                        messages=self._messages(prompt),
+                        temperature=self.temperature,
+                        max_tokens=self.max_tokens,
+                    )
+                    usage = getattr(response, "usage", None)
+                    text = (response.choices[0].message.content or "").strip()
+                else:
+                    usage = await self._stream(prompt, stripper)
+                    text = stripper.text()
+            except asyncio.CancelledError:
+                # Cancelled along with the rest of its page: give back the slot and the probe
+                self.limiter.release(started, cancelled=True)
+                if probe:
+                    self.breaker.abandon_probe()
+                raise
+            except Exception as e:
+                throttled = throttle_signal(e)
+                self.limiter.release(started, throttled=throttled, retry_after=_retry_after(e))
+                self.breaker.record(outage=outage_signal(e))
+                if throttled:
+                    self.stats["throttled"] += 1
+                if transient_error(e) and attempt < self.max_retries and not (stripper and stripper.emitted):
+                    attempt += 1
+                    self.stats["retries"] += 1
+                    await asyncio.sleep(backoff_delay(attempt))
+                    continue
+                self.stats["errors"] += 1
+                raise TranslationError(f"Request failed after {attempt + 1} attempt(s): {e}") from e
+            self.breaker.record(outage=False)
+            self.limiter.release(started)
+            break
+        self.stats["requests"] += 1
+        if usage is not None:
+            self.stats["prompt_tokens"] += usage.prompt_tokens
+            self.stats["completion_tokens"] += usage.completion_tokens
+            self.token_bucket.settle(reserved, usage.total_tokens)
+        if cache_key is not None and text:
+            self.cache.put(cache_key, text)
+        return text
+
+    async def aclose(self) -> None:
+        close = getattr(self.client, "close", None)
+        if close is not None:
+            await close()
+
+
+def pack_sections(sections: List[tuple]) -> str:
+    """Join (id, text, context) sections into one ID-tagged request body"""
+    parts = []
+    for section_id, text, context in sections:
+        header = f"[[SEG {section_id}]] {context}".rstrip()
+        parts.append(f"{header}\n{text}\n[[END {section_id}]]")
+    return "\n\n".join(parts)
+
+
+def unpack_sections(response: str, ids: Iterable[int]) -> Dict[int, str]:
+    """Parse a packed response; returns the valid, non-empty section for each expected id
+
+    Sections that are missing, duplicated or empty are left out so the caller
+    can re-request them individually.
+    """
+    expected = set(ids)
+    found: Dict[int, List[str]] = {}
+    for match in PACKED_SECTION.finditer(response):
+        found.setdefault(int(match.group(1)), []).append(match.group(2).strip())
+    return {section_id: texts[0] for section_id, texts in found.items()
+            if section_id in expected and len(texts) == 1 and texts[0] and "[[SEG " not in texts[0]}
+
+
+class SegmentPacker:
+    """Packs short translation requests into shared, ID-tagged API calls
+
+    translate() queues a segment and waits for its result. A pack is sent
+    when it reaches the token or section budget, or after `linger` seconds
+    otherwise. build_prompt(text, context) is the translator's usual prompt
+    builder: a pack is sent as build_prompt(packed_sections, PACK_CONTEXT),
+    and any segment that cannot be parsed back is re-sent alone as
+    build_prompt(text, context).
+    """
+
+    def __init__(self, backend: AsyncTranslationBackend, build_prompt: Callable[[str, str], str],
+                 max_tokens: int = DEFAULT_PACK_TOKENS, max_segments: int = DEFAULT_PACK_SEGMENTS,
+                 linger: float = DEFAULT_PACK_LINGER):
+        self.backend = backend
+        self.build_prompt = build_prompt
+        self.max_tokens = max_tokens
+        self.max_segments = max(2, max_segments)
+        self.linger = linger
+        self._pending: List[tuple] = []  # (id, text, context, future)
+        self._pending_tokens = 0
+        self._next_id = 1
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+        self.stats: Dict[str, int] = {"packed_requests": 0, "packed_segments": 0, "pack_fallbacks": 0}
+
+    def accepts(self, text: str) -> bool:
+        """Whether a segment is short enough to be packed"""
+        return estimate_tokens(text) <= PACK_SEGMENT_TOKENS
+
+    async def translate(self, text: str, context: str = "") -> str:
+        tokens = estimate_tokens(text)
+        if self._pending and self._pending_tokens + tokens > self.max_tokens:
+            self._flush()
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((self._next_id, text, context, future))
+        self._next_id += 1
+        self._pending_tokens += tokens
+        if self._pending_tokens >= self.max_tokens or len(self._pending) >= self.max_segments:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.linger, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending, self._pending_tokens = self._pending, [], 0
+        if batch:
+            task = asyncio.ensure_future(self._send(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send_single(self, item: tuple) -> None:
+        _, text, context, future = item
+        try:
+            result = await self.backend.complete(self.build_prompt(text, context))
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            return
+        if not future.done():
+            future.set_result(result)
+
+    async def _send(self, batch: List[tuple]) -> None:
+        if len(batch) == 1:
+            await self._send_single(batch[0])
+            return
+
+        try:
+            packed = pack_sections([(section_id, text, context) for section_id, text, context, _ in batch])
+            response = await self.backend.complete(self.build_prompt(packed, PACK_CONTEXT))
+            results = unpack_sections(response, [item[0] for item in batch])
+        except Exception as e:
+            logger.warning(f"Packed request for {len(batch)} segments failed ({e}); sending them individually")
+            results = {}
+
+        self.stats["packed_requests"] += 1
+        retry = []
+        for item in batch:
+            section_id, _, _, future = item
+            if section_id in results:
+                self.stats["packed_segments"] += 1
+                if not future.done():
+                    future.set_result(results[section_id])
+            else:
+                retry.append(item)
+        if retry:
+            self.stats["pack_fallbacks"] += len(retry)
+            await asyncio.gather(*(self._send_single(item) for item in retry))
+
+
+_QUEUE_DONE = object()
+
+
+async def run_queue(items: Iterable, handle: Callable[[Any], Awaitable[None]], workers: int,
+                    maxsize: int = 0) -> None:
+    """Run handle(item) for every item with `workers` consumers on a bounded queue
+
+    Items are pulled from the iterable only as queue space frees up. Errors
+    raised by handle are logged and do not stop the other workers.
+    """
+    workers = max(1, workers)
+    queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize or workers * 2)
+
+    async def produce():
+        for item in items:
+            await queue.put(item)
+        for _ in range(workers):
+            await queue.put(_QUEUE_DONE)
+
+    async def consume():
+        while True:
+            item = await queue.get()
+            if item is _QUEUE_DONE:
+                return
+            try:
+                await handle(item)
+            except Exception as e:
+                logger.error(f"Unhandled error for {item}: {e}")
+
+    await asyncio.gather(produce(), *(consume() for _ in range(workers)))
+
+
+class OrderedChunkWriter:
+    """Writes concurrently produced chunks to a text file in chunk order
+
+    Text for the chunk currently being written goes straight to the file;
+    text for later chunks is buffered until every chunk before them has
+    finished. reset() discards a chunk's text so it can be produced again,
+    truncating the file if that text was already written. progress, if
+    given, is called with the number of bytes written so far. After close()
+    every call is ignored, so late deltas never reach a closed file.
+    """
+
+    def __init__(self, out, progress: Optional[Callable[[int], None]] = None):
+        self.out = out
+        self.progress = progress
+        self.bytes_written = 0
+        self._current = 0
+        self._chunk_start = out.tell()
+        self._chunk_bytes = 0
+        self._buffers: Dict[int, List[str]] = {}
+        self._finished: set = set()
+        self._closed = False
+
+    def close(self) -> None:
+        self._closed = True
+        self._buffers.clear()
+
+    def _emit(self, text: str) -> None:
+        self.out.write(text)
+        size = len(text.encode("utf-8"))
+        self.bytes_written += size
+        self._chunk_bytes += size
+        if self.progress is not None:
+            self.progress(self.bytes_written)
+
+    def write(self, index: int, text: str) -> None:
+        if self._closed:
+            return
+        if index == self._current:
+            self._emit(text)
+        else:
+            self._buffers.setdefault(index, []).append(text)
+
+    def reset(self, index: int) -> None:
+        if self._closed:
+            return
+        if index == self._current:
+            self.out.seek(self._chunk_start)
+            self.out.truncate()
+            self.bytes_written -= self._chunk_bytes
+            self._chunk_bytes = 0
+        else:
+            self._buffers.pop(index, None)
+
+    def finish(self, index: int) -> None:
+        if self._closed:
+            return
+        self._finished.add(index)
+        while self._current in self._finished:
+            self._current += 1
+            self._chunk_start = self.out.tell()
+            self._chunk_bytes = 0
+            buffered = self._buffers.pop(self._current, None)
+            if buffered:
+                self._emit("".join(buffered))
+
+
+async def translate_chunked(text: str, translate: Callable[..., Awaitable[str]],
+                            max_tokens: int = DEFAULT_CHUNK_TOKENS, retries: int = DEFAULT_CHUNK_RETRIES,
+                            fallback: Optional[Callable[[str], str]] = None,
+                            sink: Optional[OrderedChunkWriter] = None) -> str:
+    """Translate a Markdown body chunk by chunk and reassemble it in order
+
+    translate(chunk, part) is awaited for every chunk concurrently; part is
+    "" for a single chunk, else e.g. "part 2/5". Each chunk is retried up to
+    `retries` times on its own. A chunk that still fails goes to fallback(chunk)
+    when given, otherwise the error propagates once the remaining chunk
+    tasks have been cancelled. Whitespace around each chunk
+    is kept verbatim so block spacing survives the stripped responses.
+
+    With a sink, translate is called as translate(chunk, part, on_delta) and
+    every chunk's text is also written to the sink as it arrives.
+    """
+    chunks = chunk_markdown(text, max_tokens, estimate_tokens)
+    total = len(chunks)
+
+    async def translate_one(index: int, chunk: str) -> str:
+        core = chunk.strip()
+        if not core:
+            if sink is not None:
+                sink.write(index, chunk)
+                sink.finish(index)
+            return chunk
+        lead = chunk[:len(chunk) - len(chunk.lstrip())]
+        trail = chunk[len(chunk.rstrip()):]
+        part = f"part {index + 1}/{total}" if total > 1 else ""
+        result = None
+        for attempt in range(retries + 1):
+            try:
+                if sink is None:
+                    result = await translate(core, part)
+                else:
+                    sink.write(index, lead)
+                    result = await translate(core, part, lambda delta: sink.write(index, delta))
+                break
+            except Exception as e:
+                if sink is not None:
+                    sink.reset(index)
+                if attempt < retries:
+                    logger.warning(f"Chunk {index + 1}/{total} failed ({e}); retrying")
+                elif fallback is None:
+                    raise
+                else:
+                    logger.error(f"Chunk {index + 1}/{total} failed after {retries + 1} attempts: {e}")
+        if result is None:
+            result = fallback(core)
+            if sink is not None:
+                sink.write(index, lead + result)
+        if sink is not None:
+            sink.write(index, trail)
+            sink.finish(index)
+        return lead + result + trail
+
+    tasks = [asyncio.ensure_future(translate_one(i, chunk)) for i, chunk in enumerate(chunks)]
+    try:
+        translated = await asyncio.gather(*tasks)
+    except BaseException:
+        # Stop sibling chunks from spending more requests on a failed page
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    return "".join(translated)
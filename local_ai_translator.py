@@ -14,48 +14,512 @@ Features:
 
 import os
 import re
+import sys
 import json
+import hashlib
 import logging
+import threading
+from time import perf_counter
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Tuple, Optional
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from types import MappingProxyType
+
+from arabic_postprocess import ArabicPostProcessor, arabic_only_cleanup, arabic_typography
+from markdown_blocks import tokenize_blocks
+from placeholders import protect, restore
+from reusables import ReusableIndex, translate_reusables
+from segment_index import build_segment_index, pretranslate
+from script_histogram import arabic_ratio, script_histogram
+from translation_memory import open_translation_memory, DEFAULT_FILENAME as TM_FILENAME
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-class LocalAITranslator:
-    """Advanced local translator with AI-like intelligence"""
+# off: no per-segment counters; counters: totals; detailed: adds stage timings and per-term counts
+STATS_LEVELS = ("off", "counters", "detailed")
+
+# Segments deduplicated and translated per batch while a document streams out
+BATCH_WINDOW_SEGMENTS = 256
+
+class TermMatcher:
+    """Compiled longest-match-wins matcher over a term → replacement mapping.
+
+    All terms are folded into a single case-insensitive regex shaped like a
+    trie (shared prefixes are factored out and longer continuations are tried
+    first), so one left-to-right scan applies every substitution.
+    """
+
+    def __init__(self, mapping: Dict[str, str]):
+        # Later keys win on case-insensitive collisions, as with sequential re.sub
+        self.mapping: Dict[str, str] = {}
+        for term, replacement in mapping.items():
+            self.mapping[term.lower()] = replacement
+
+        trie: Dict = {}
+        for term in self.mapping:
+            node = trie
+            for ch in term:
+                node = node.setdefault(ch, {})
+            node[""] = True
+
+        body = self._trie_pattern(trie)
+        self.pattern = re.compile(r"\b(?:" + body + r")\b", re.IGNORECASE) if body else None
+        self.mapping = MappingProxyType(self.mapping)
+
+    @classmethod
+    def _trie_pattern(cls, node: Dict) -> str:
+        alternatives = [re.escape(ch) + cls._trie_pattern(child)
+                        for ch, child in sorted(node.items()) if ch != ""]
+        if not alternatives:
+            return ""
+        if len(alternatives) == 1:
+            body = alternatives[0]
+        else:
+            body = "(?:" + "|".join(alternatives) + ")"
+        if "" in node:
+            # Greedy optional group: the longer continuation is tried first
+            body = "(?:" + body + ")?"
+        return body
+
+    def sub(self, text: str, counts: Optional[Dict[str, int]] = None) -> Tuple[str, int]:
+        """Replace every term occurrence in one pass; returns (text, count).
+
+        If counts is given, it is updated with the number of hits per term.
+        """
+        if self.pattern is None:
+            return text, 0
+        mapping = self.mapping
+        if counts is None:
+            return self.pattern.subn(lambda m: mapping[m.group(0).lower()], text)
+
+        def _counted(m: re.Match) -> str:
+            term = m.group(0).lower()
+            counts[term] = counts.get(term, 0) + 1
+            return mapping[term]
+
+        return self.pattern.subn(_counted, text)
+
+    def find(self, text: str) -> List[str]:
+        """Distinct terms (lowercased) occurring in text, in order of first occurrence"""
+        if self.pattern is None:
+            return []
+        return list(dict.fromkeys(m.group(0).lower() for m in self.pattern.finditer(text)))
+
+
+class LexicalFallback:
+    """Tokenizer-driven word/phrase replacement in a single pass.
+
+    The text is split into word tokens once; at each token the longest phrase
+    (up to the longest key in the map) is looked up in a hash map and the
+    output is rebuilt from the original separators. Tokens are maximal
+    ``\\w+`` runs, so matching keeps ``\\b`` word-boundary semantics and
+    ``__PRESERVE_*__`` placeholders are a single token that never matches.
+    """
+
+    WORD_RE = re.compile(r"\w+")
+
+    def __init__(self, mapping: Dict[str, str]):
+        self.mapping: Dict[str, str] = {}
+        for phrase, replacement in mapping.items():
+            self.mapping[phrase.lower()] = replacement
+        self.max_words = max((len(self.WORD_RE.findall(k)) for k in self.mapping), default=1)
+        self.mapping = MappingProxyType(self.mapping)
+
+    def apply(self, text: str) -> str:
+        tokens = [(m.start(), m.end()) for m in self.WORD_RE.finditer(text)]
+        out: List[str] = []
+        pos = 0
+        i = 0
+        n = len(tokens)
+        while i < n:
+            start = tokens[i][0]
+            for width in range(min(self.max_words, n - i), 0, -1):
+                end = tokens[i + width - 1][1]
+                replacement = self.mapping.get(text[start:end].lower())
+                if replacement is not None:
+                    out.append(text[pos:start])
+                    out.append(replacement)
+                    pos = end
+                    i += width
+                    break
+            else:
+                i += 1
+        out.append(text[pos:])
+        return "".join(out)
+
+
+class TranslatorKnowledgeBase:
+    """Immutable terminology, rules and matchers shared by every translator in a process.
+
+    Built once by get_knowledge_base(); after construction every mapping is a
+    read-only view and every list a tuple, so instances can be shared freely
+    between translators, threads and requests.
+    """
+
+    # Bump when translation logic changes in a way that alters output
+    ENGINE_REVISION = 3
+
+    def __init__(self):
+        self.setup_terminology_database()
+        self.setup_linguistic_rules()
+        self.setup_content_patterns()
+        self.setup_github_domain_knowledge()
+        self.setup_lexical_fallback()
+
+        # Content hash of every database; changes whenever a glossary entry does
+        fingerprint = json.dumps(
+            [self.ENGINE_REVISION, self.terminology, sorted(self.glossary_exclusions), self.linguistic_rules,
+             self.content_patterns, self.lexical_map],
+            sort_keys=True, ensure_ascii=False,
+        )
+        self.version = hashlib.sha1(fingerprint.encode("utf-8")).hexdigest()[:12]
+
+        # Compiled forms used on the hot path
+        self.linguistic_patterns = tuple(
+            (re.compile(pattern), replacement)
+            for category, rules in self.linguistic_rules.items()
+            if category != "technical_context" and isinstance(rules, dict) and "patterns" in rules
+            for pattern, replacement in rules["patterns"]
+        )
+        self.content_pattern_rules = {
+            category: tuple((re.compile(pattern, re.MULTILINE), replacement) for pattern, replacement in rules)
+            for category, rules in self.content_patterns.items()
+        }
+
+        for name in ("terminology", "reverse_terminology", "linguistic_rules", "content_patterns",
+                     "content_pattern_rules", "github_contexts", "lexical_map"):
+            setattr(self, name, _freeze(getattr(self, name)))
+        self._frozen = True
+
+    def __setattr__(self, name, value):
+        if getattr(self, "_frozen", False):
+            raise AttributeError(f"{type(self).__name__} is immutable")
+        object.__setattr__(self, name, value)
+
+    def glossary_for(self, text: str, limit: Optional[int] = None) -> List[Tuple[str, str]]:
+        """(term, Arabic) pairs for the terminology entries that occur in text
+        
+        Code, liquid, URLs and HTML are masked first, so terms inside them
+        do not count. Action words and phrase cues are left out.
+        """
+        masked, _ = protect(text)
+        terms = [term for term in self.term_matcher.find(masked) if term not in self.glossary_exclusions]
+        if limit is not None:
+            terms = terms[:limit]
+        return [(term, self.term_matcher.mapping[term]) for term in terms]
+
+    def setup_terminology_database(self):
+        """Comprehensive technical terminology database"""
+        
+        # Verbs and phrase cues steer the local engine only; they are kept out
+        # of LLM glossaries, where "exactly as given" would make them literal
+        action_words = {
+            "create": "إنشاء",
+            "delete": "حذف",
+            "update": "تحديث",
+            "edit": "تحرير",
+            "manage": "إدارة",
+            "configure": "تكوين",
+            "setup": "إعداد",
+            "install": "تثبيت",
+            "deploy": "نشر",
+            "publish": "نشر",
+            "share": "مشاركة",
+            "collaborate": "التعاون",
+            "contribute": "المساهمة",
+            "review": "مراجعة",
+            "approve": "الموافقة",
+            "reject": "رفض",
+        }
+        phrase_cues = {
+            "in your": "في الخاص بك",
+            "before you begin": "قبل أن تبدأ",
+            "at this stage": "في هذه المرحلة",
+            "for example": "على سبيل المثال",
+            "by updating": "عن طريق تحديث",
+            "by default": "افتراضيًا",
+            "to get started": "للبدء",
+            "you can now": "يمكنك الآن",
+            "next steps": "الخطوات التالية",
+        }
+        
+        self.terminology = {
+            # Core GitHub Terms
+            "repository": "المستودع",
+            "repositories": "المستودعات", 
+            "commit": "الالتزام",
+            "commits": "الالتزامات",
+            "pull request": "طلب السحب",
+            "pull requests": "طلبات السحب",
+            "issue": "القضية",
+            "issues": "القضايا",
+            "branch": "الفرع",
+            "branches": "الفروع",
+            "merge": "الدمج",
+            "fork": "النسخة المتفرعة",
+            "clone": "الاستنساخ",
+            "push": "الدفع",
+            "fetch": "الجلب",
+            "workflow": "سير العمل",
+            "workflows": "سير العمل",
+            
+            # Authentication & Security
+            "authentication": "المصادقة",
+            "authorization": "التخويل",
+            "token": "الرمز المميز",
+            "tokens": "الرموز المميزة",
+            "API key": "مفتاح API",
+            "SSH key": "مفتاح SSH",
+            "OAuth": "OAuth",
+            "two-factor authentication": "المصادقة ثنائية العامل",
+            "2FA": "المصادقة ثنائية العامل",
+            "passkey": "مفتاح المرور",
+            "passkeys": "مفاتيح المرور",
+            "single sign-on": "تسجيل الدخول الموحد",
+            "SSO": "تسجيل الدخول الموحد",
+            
+            # Actions & CI/CD
+            "GitHub Actions": "GitHub Actions",
+            "action": "الإجراء",
+            "actions": "الإجراءات",
+            "runner": "المشغل",
+            "runners": "المشغلون",
+            "job": "المهمة",
+            "jobs": "المهام",
+            "step": "الخطوة",
+            "steps": "الخطوات",
+            "artifact": "المنتج",
+            "artifacts": "المنتجات",
+            "deployment": "النشر",
+            "continuous integration": "التكامل المستمر",
+            "CI/CD": "CI/CD",
+            "build": "البناء",
+            
+            # Organizations & Teams
+            "organization": "المنظمة",
+            "organizations": "المنظمات",
+            "team": "الفريق",
+            "teams": "الفرق",
+            "member": "العضو",
+            "members": "الأعضاء",
+            "owner": "المالك",
+            "admin": "المسؤول",
+            "collaborator": "المتعاون",
+            "collaborators": "المتعاونون",
+            
+            # Development Terms
+            "code": "الكود",
+            "source code": "الكود المصدري",
+            "codebase": "قاعدة الكود",
+            "developer": "المطور",
+            "developers": "المطورون",
+            "development": "التطوير",
+            "programming": "البرمجة",
+            "software": "البرمجيات",
+            "application": "التطبيق",
+            "project": "المشروع",
+            "file": "الملف",
+            "files": "الملفات",
+            "folder": "المجلد",
+            "directory": "الدليل",
+            
+            # Git Terms
+            "git": "Git",
+            "version control": "التحكم في الإصدارات",
+            "staging": "التجهيز",
+            "stash": "المخزن المؤقت",
+            "diff": "الفرق",
+            "log": "السجل",
+            "remote": "البعيد",
+            "origin": "الأصل",
+            "upstream": "المنبع",
+            "downstream": "المصب",
+            
+            # General Tech Terms
+            "API": "API",
+            "URL": "URL",
+            "HTTP": "HTTP",
+            "HTTPS": "HTTPS",
+            "JSON": "JSON",
+            "YAML": "YAML",
+            "markdown": "Markdown",
+            "command line": "سطر الأوامر",
+            "terminal": "الطرفية",
+            "shell": "الصدفة",
+            "script": "النص البرمجي",
+            "configuration": "التكوين",
+            "settings": "الإعدادات",
+            "permissions": "الأذونات",
+            "access": "الوصول",
+            "security": "الأمان",
+            "privacy": "الخصوصية",
+            "token": "رمز الوصول",
+            "access token": "رمز الوصول",
+            "access tokens": "رموز الوصول",
+            "user access token": "رمز وصول المستخدم",
+            "user access tokens": "رموز وصول المستخدم",
+            "installation access token": "رمز وصول التثبيت",
+            "installation access tokens": "رموز وصول التثبيت",
+            
+            **action_words,
+
+            # Common Phrases
+            "getting started": "البدء",
+            "quick start": "البدء السريع",
+            "learn more": "تعلم المزيد",
+            "read more": "اقرأ المزيد",
+            "see also": "انظر أيضًا",
+            "for more information": "لمزيد من المعلومات",
+            "best practices": "أفضل الممارسات",
+            "troubleshooting": "استكشاف الأخطاء وإصلاحها",
+            "documentation": "المستندات",
+            "tutorial": "الدرس التعليمي",
+            "guide": "الدليل",
+            "example": "مثال",
+            "examples": "أمثلة",
+            "libraries": "المكتبات",
+            "network configurations": "تكوينات الشبكة",
+            "codes of conduct": "مدونات السلوك",
+            "code of conduct": "مدونة السلوك",
+            "anti-bribery": "مكافحة الرشوة",
+            "modern slavery": "العبودية الحديثة",
+            "child labor": "عمل الأطفال",
+            "subprocessors": "معالجات فرعية",
+            "subprocessor": "معالج فرعي",
+            "embeddings": "تضمينات",
+            "keyboard shortcuts": "اختصارات لوحة المفاتيح",
+
+            # Audit cue translations
+            "overview": "نظرة عامة",
+            "summary": "الملخص",
+            "steps": "الخطوات",
+            "prerequisites": "المتطلبات المسبقة",
+            "note": "ملاحظة",
+            "tip": "نصيحة",
+            "caution": "تحذير",
+            "warning": "تحذير",
+            "this guide": "هذا الدليل",
+            "about github": "حول GitHub",
+
+            **phrase_cues,
+        }
+        
+        self.glossary_exclusions = frozenset(action_words) | frozenset(phrase_cues)
+        
+        # Create reverse mapping for context awareness
+        self.reverse_terminology = {v: k for k, v in self.terminology.items()}
+
+        # Single-pass matcher used by translate_text_intelligent
+        self.term_matcher = TermMatcher(self.terminology)
+    
+    def setup_linguistic_rules(self):
+        """Advanced Arabic linguistic rules"""
+        
+        self.linguistic_rules = {
+            # Article rules
+            "definite_article": {
+                "patterns": [
+                    (r'\bthe\s+([a-zA-Z]+)', r'ال\1'),  # Basic "the" translation
+                    (r'\ba\s+([a-zA-Z]+)', r'\1'),      # Remove indefinite articles
+                    (r'\ban\s+([a-zA-Z]+)', r'\1')      # Remove indefinite articles
+                ]
+            },
+            
+            # Sentence structure improvements
+            "sentence_structure": {
+                "patterns": [
+                    # Convert "You can..." to "يمكنك..."
+                    (r'\bYou can\s+([^.]+)', r'يمكنك \1'),
+                    # Convert "To do X..." to "لـ..."
+                    (r'\bTo\s+([a-zA-Z]+)', r'لـ\1'),
+                    # Convert "This will..." to "سيؤدي هذا إلى..."
+                    (r'\bThis will\s+([^.]+)', r'سيؤدي هذا إلى \1'),
+                    # Convert "Learn how to..." to "تعلم كيفية..."
+                    (r'\bLearn how to\s+([^.]+)', r'تعلم كيفية \1')
+                ]
+            },
+            
+            # Technical context patterns
+            "technical_context": {
+                "code_blocks": r'```[\s\S]*?```',
+                "inline_code": r'`[^`]+`',
+                "liquid_tags": r'{%[^%]*%}',
+                "liquid_variables": r'{{[^}]*}}',
+                "urls": r'https?://[^\s]+',
+                "file_paths": r'[a-zA-Z0-9._/-]+\.[a-zA-Z]{2,4}'
+            }
+        }
+    
+    def setup_content_patterns(self):
+        """Content structure and pattern recognition"""
+        
+        self.content_patterns = {
+            # Common GitHub documentation patterns
+            "introduction_patterns": [
+                (r'^## About (.+)', r'## حول \1'),
+                (r'^### What is (.+)\?', r'### ما هو \1؟'),
+                (r'^### Why (.+)\?', r'### لماذا \1؟'),
+                (r'^### How (.+)', r'### كيف \1'),
+                (r'^### When (.+)', r'### متى \1')
+            ],
+            
+            "instruction_patterns": [
+                (r'^### Step (\d+):', r'### الخطوة \1:'),
+                (r'^#### Prerequisites', r'#### المتطلبات المسبقة'),
+                (r'^#### Requirements', r'#### المتطلبات'),
+                (r'^#### Before you begin', r'#### قبل أن تبدأ'),
+                (r'^### Next steps', r'### الخطوات التالية')
+            ],
+            
+            "navigation_patterns": [
+                (r'In this article', r'في هذا المقال'),
+                (r'Table of contents', r'جدول المحتويات'),
+                (r'See also', r'انظر أيضًا'),
+                (r'Related articles', r'المقالات ذات الصلة'),
+                (r'Further reading', r'قراءة إضافية')
+            ]
+        }
     
-    def __init__(self, docs_root: Optional[str] = None, aggressive: bool = False, arabic_only: bool = False):
-        # Resolve docs_root relative to this script if not absolute
-        script_dir = Path(__file__).parent
-        if docs_root is None:
-            self.docs_root = (script_dir / "docs").resolve()
-        else:
-            candidate = Path(docs_root)
-            self.docs_root = (candidate if candidate.is_absolute() else (script_dir / candidate)).resolve()
-        self.content_root = self.docs_root / "content"
-        self.aggressive = aggressive
-        self.arabic_only = arabic_only
-        self.fallback_threshold = 0.6 if aggressive else 0.25
-        
-        # Initialize translation databases
-        self.setup_terminology_database()
-        self.setup_linguistic_rules()
-        self.setup_content_patterns()
-        self.setup_github_domain_knowledge()
-        self.setup_lexical_fallback()
+    def setup_github_domain_knowledge(self):
+        """GitHub-specific domain knowledge and context"""
         
-        # Statistics tracking
-        self.stats = {
-            "files_processed": 0,
-            "translations_enhanced": 0,
-            "terminology_applications": 0,
-            "pattern_matches": 0,
-            "linguistic_improvements": 0
+        self.github_contexts = {
+            # Product names (keep in English with Arabic explanation)
+            "products": {
+                "GitHub Desktop": "GitHub Desktop",
+                "GitHub CLI": "GitHub CLI",
+                "GitHub Mobile": "GitHub Mobile", 
+                "GitHub Codespaces": "GitHub Codespaces",
+                "GitHub Copilot": "GitHub Copilot",
+                "GitHub Actions": "GitHub Actions",
+                "GitHub Pages": "GitHub Pages",
+                "GitHub Packages": "GitHub Packages"
+            },
+            
+            # Feature explanations
+            "feature_explanations": {
+                "GitHub Desktop": "تطبيق سطح المكتب لـ GitHub",
+                "GitHub CLI": "واجهة سطر الأوامر لـ GitHub", 
+                "Codespaces": "بيئات التطوير السحابية",
+                "Copilot": "مساعد البرمجة بالذكاء الاصطناعي",
+                "Actions": "أتمتة سير العمل والتكامل المستمر",
+                "Pages": "استضافة المواقع الثابتة",
+                "Packages": "إدارة وتوزيع الحزم"
+            },
+            
+            # Common workflows
+            "workflows": {
+                "fork_and_pull": "النسخ المتفرع وطلب السحب",
+                "gitflow": "سير عمل Git",
+                "feature_branch": "فرع الميزة",
+                "release_management": "إدارة الإصدارات"
+            }
         }
+    
 
     def setup_lexical_fallback(self):
         """High-frequency English→Arabic lexical mappings for offline translation."""
@@ -293,364 +757,256 @@ class LocalAITranslator:
             "codespaces": "Codespaces",
             "overview": "نظرة عامة",
             "summary": "الملخص",
-            "prerequisites": "المتطلبات المسبقة",
-            "warning": "تحذير",
-            "caution": "تحذير",
-            "tip": "نصيحة",
-            "note": "ملاحظة",
-        }
-
-    def _arabic_ratio(self, text: str) -> float:
-        total_letters = len(re.findall(r"[A-Za-z\u0600-\u06FF]", text))
-        if total_letters == 0:
-            return 1.0
-        arabic_letters = len(re.findall(r"[\u0600-\u06FF]", text))
-        return arabic_letters / total_letters
-
-    def _apply_lexical_fallback(self, text: str) -> str:
-        # Apply word-level replacements conservatively with word boundaries
-        result = text
-        for en, ar in self.lexical_map.items():
-            pattern = r"\b" + re.escape(en) + r"\b"
-            result = re.sub(pattern, ar, result, flags=re.IGNORECASE)
-        return result
-
-    def _arabic_typography(self, text: str) -> str:
-        # Apply Arabic typography only on lines containing Arabic
-        digit_map = str.maketrans("0123456789", "٠١٢٣٤٥٦٧٨٩")
-        out_lines: List[str] = []
-        for line in text.splitlines():
-            if re.search(r"[\u0600-\u06FF]", line):
-                l = line.translate(digit_map)
-                l = l.replace("?", "؟").replace(";", "؛").replace(",", "،")
-                l = re.sub(r"[ \t]+", " ", l)
-                out_lines.append(l)
-            else:
-                out_lines.append(line)
-        return "\n".join(out_lines)
-
-    def _arabic_only_cleanup(self, text: str) -> str:
-        # Remove fenced and inline code, liquid, URLs/emails, HTML tags
-        cleaned = re.sub(r"```[\s\S]*?```", "", text)
-        cleaned = re.sub(r"`[^`]+`", "", cleaned)
-        cleaned = re.sub(r"({%[^%]*%}|{{[^}]*}})", "", cleaned)
-        cleaned = re.sub(r"https?://\S+", "", cleaned)
-        cleaned = re.sub(r"\b\S+@\S+\b", "", cleaned)
-        cleaned = re.sub(r"<[^>]+>", " ", cleaned)
-
-        # Drop Latin letters; keep digits and punctuation for now
-        cleaned = re.sub(r"[A-Za-z]", "", cleaned)
-
-        # Keep only lines with Arabic content
-        kept_lines: List[str] = []
-        for line in cleaned.splitlines():
-            ln = line.strip()
-            if not ln:
-                continue
-            if re.search(r"[\u0600-\u06FF]", ln):
-                kept_lines.append(ln)
-
-        result = "\n".join(kept_lines)
-        result = re.sub(r"\n{3,}", "\n\n", result).strip()
-        # Apply Arabic typography at the end
-        return self._arabic_typography(result)
-    
-    def setup_terminology_database(self):
-        """Comprehensive technical terminology database"""
-        
-        self.terminology = {
-            # Core GitHub Terms
-            "repository": "المستودع",
-            "repositories": "المستودعات", 
-            "commit": "الالتزام",
-            "commits": "الالتزامات",
-            "pull request": "طلب السحب",
-            "pull requests": "طلبات السحب",
-            "issue": "القضية",
-            "issues": "القضايا",
-            "branch": "الفرع",
-            "branches": "الفروع",
-            "merge": "الدمج",
-            "fork": "النسخة المتفرعة",
-            "clone": "الاستنساخ",
-            "push": "الدفع",
-            "fetch": "الجلب",
-            "workflow": "سير العمل",
-            "workflows": "سير العمل",
-            
-            # Authentication & Security
-            "authentication": "المصادقة",
-            "authorization": "التخويل",
-            "token": "الرمز المميز",
-            "tokens": "الرموز المميزة",
-            "API key": "مفتاح API",
-            "SSH key": "مفتاح SSH",
-            "OAuth": "OAuth",
-            "two-factor authentication": "المصادقة ثنائية العامل",
-            "2FA": "المصادقة ثنائية العامل",
-            "passkey": "مفتاح المرور",
-            "passkeys": "مفاتيح المرور",
-            "single sign-on": "تسجيل الدخول الموحد",
-            "SSO": "تسجيل الدخول الموحد",
-            
-            # Actions & CI/CD
-            "GitHub Actions": "GitHub Actions",
-            "action": "الإجراء",
-            "actions": "الإجراءات",
-            "runner": "المشغل",
-            "runners": "المشغلون",
-            "job": "المهمة",
-            "jobs": "المهام",
-            "step": "الخطوة",
-            "steps": "الخطوات",
-            "artifact": "المنتج",
-            "artifacts": "المنتجات",
-            "deployment": "النشر",
-            "continuous integration": "التكامل المستمر",
-            "CI/CD": "CI/CD",
-            "build": "البناء",
-            
-            # Organizations & Teams
-            "organization": "المنظمة",
-            "organizations": "المنظمات",
-            "team": "الفريق",
-            "teams": "الفرق",
-            "member": "العضو",
-            "members": "الأعضاء",
-            "owner": "المالك",
-            "admin": "المسؤول",
-            "collaborator": "المتعاون",
-            "collaborators": "المتعاونون",
-            
-            # Development Terms
-            "code": "الكود",
-            "source code": "الكود المصدري",
-            "codebase": "قاعدة الكود",
-            "developer": "المطور",
-            "developers": "المطورون",
-            "development": "التطوير",
-            "programming": "البرمجة",
-            "software": "البرمجيات",
-            "application": "التطبيق",
-            "project": "المشروع",
-            "file": "الملف",
-            "files": "الملفات",
-            "folder": "المجلد",
-            "directory": "الدليل",
-            
-            # Git Terms
-            "git": "Git",
-            "version control": "التحكم في الإصدارات",
-            "staging": "التجهيز",
-            "stash": "المخزن المؤقت",
-            "diff": "الفرق",
-            "log": "السجل",
-            "remote": "البعيد",
-            "origin": "الأصل",
-            "upstream": "المنبع",
-            "downstream": "المصب",
-            
-            # General Tech Terms
-            "API": "API",
-            "URL": "URL",
-            "HTTP": "HTTP",
-            "HTTPS": "HTTPS",
-            "JSON": "JSON",
-            "YAML": "YAML",
-            "markdown": "Markdown",
-            "command line": "سطر الأوامر",
-            "terminal": "الطرفية",
-            "shell": "الصدفة",
-            "script": "النص البرمجي",
-            "configuration": "التكوين",
-            "settings": "الإعدادات",
-            "permissions": "الأذونات",
-            "access": "الوصول",
-            "security": "الأمان",
-            "privacy": "الخصوصية",
-            "token": "رمز الوصول",
-            "access token": "رمز الوصول",
-            "access tokens": "رموز الوصول",
-            "user access token": "رمز وصول المستخدم",
-            "user access tokens": "رموز وصول المستخدم",
-            "installation access token": "رمز وصول التثبيت",
-            "installation access tokens": "رموز وصول التثبيت",
-            
-            # Action Words
-            "create": "إنشاء",
-            "delete": "حذف",
-            "update": "تحديث",
-            "edit": "تحرير",
-            "manage": "إدارة",
-            "configure": "تكوين",
-            "setup": "إعداد",
-            "install": "تثبيت",
-            "deploy": "نشر",
-            "publish": "نشر",
-            "share": "مشاركة",
-            "collaborate": "التعاون",
-            "contribute": "المساهمة",
-            "review": "مراجعة",
-            "approve": "الموافقة",
-            "reject": "رفض",
-            
-            # Common Phrases
-            "getting started": "البدء",
-            "quick start": "البدء السريع",
-            "learn more": "تعلم المزيد",
-            "read more": "اقرأ المزيد",
-            "see also": "انظر أيضًا",
-            "for more information": "لمزيد من المعلومات",
-            "best practices": "أفضل الممارسات",
-            "troubleshooting": "استكشاف الأخطاء وإصلاحها",
-            "documentation": "المستندات",
-            "tutorial": "الدرس التعليمي",
-            "guide": "الدليل",
-            "example": "مثال",
-            "examples": "أمثلة",
-            "libraries": "المكتبات",
-            "network configurations": "تكوينات الشبكة",
-            "codes of conduct": "مدونات السلوك",
-            "code of conduct": "مدونة السلوك",
-            "anti-bribery": "مكافحة الرشوة",
-            "modern slavery": "العبودية الحديثة",
-            "child labor": "عمل الأطفال",
-            "subprocessors": "معالجات فرعية",
-            "subprocessor": "معالج فرعي",
-            "embeddings": "تضمينات",
-            "keyboard shortcuts": "اختصارات لوحة المفاتيح",
-
-            # Audit cue translations
-            "overview": "نظرة عامة",
-            "summary": "الملخص",
-            "steps": "الخطوات",
-            "prerequisites": "المتطلبات المسبقة",
-            "note": "ملاحظة",
-            "tip": "نصيحة",
-            "caution": "تحذير",
-            "warning": "تحذير",
-            "this guide": "هذا الدليل",
-            "about github": "حول GitHub"
-            ,
-            # Added phrase cues
-            "in your": "في الخاص بك",
-            "before you begin": "قبل أن تبدأ",
-            "at this stage": "في هذه المرحلة",
-            "for example": "على سبيل المثال",
-            "by updating": "عن طريق تحديث",
-            "by default": "افتراضيًا",
-            "to get started": "للبدء",
-            "you can now": "يمكنك الآن",
-            "next steps": "الخطوات التالية"
+            "prerequisites": "المتطلبات المسبقة",
+            "warning": "تحذير",
+            "caution": "تحذير",
+            "tip": "نصيحة",
+            "note": "ملاحظة",
         }
-        
-        # Create reverse mapping for context awareness
-        self.reverse_terminology = {v: k for k, v in self.terminology.items()}
-    
-    def setup_linguistic_rules(self):
-        """Advanced Arabic linguistic rules"""
-        
-        self.linguistic_rules = {
-            # Article rules
-            "definite_article": {
-                "patterns": [
-                    (r'\bthe\s+([a-zA-Z]+)', r'ال\1'),  # Basic "the" translation
-                    (r'\ba\s+([a-zA-Z]+)', r'\1'),      # Remove indefinite articles
-                    (r'\ban\s+([a-zA-Z]+)', r'\1')      # Remove indefinite articles
-                ]
-            },
-            
-            # Sentence structure improvements
-            "sentence_structure": {
-                "patterns": [
-                    # Convert "You can..." to "يمكنك..."
-                    (r'\bYou can\s+([^.]+)', r'يمكنك \1'),
-                    # Convert "To do X..." to "لـ..."
-                    (r'\bTo\s+([a-zA-Z]+)', r'لـ\1'),
-                    # Convert "This will..." to "سيؤدي هذا إلى..."
-                    (r'\bThis will\s+([^.]+)', r'سيؤدي هذا إلى \1'),
-                    # Convert "Learn how to..." to "تعلم كيفية..."
-                    (r'\bLearn how to\s+([^.]+)', r'تعلم كيفية \1')
-                ]
-            },
-            
-            # Technical context patterns
-            "technical_context": {
-                "code_blocks": r'```[\s\S]*?```',
-                "inline_code": r'`[^`]+`',
-                "liquid_tags": r'{%[^%]*%}',
-                "liquid_variables": r'{{[^}]*}}',
-                "urls": r'https?://[^\s]+',
-                "file_paths": r'[a-zA-Z0-9._/-]+\.[a-zA-Z]{2,4}'
-            }
+        self.lexical_engine = LexicalFallback(self.lexical_map)
+
+
+
+def _freeze(value):
+    """Recursively convert dicts to read-only mappings and lists to tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+_KNOWLEDGE_BASE: Optional[TranslatorKnowledgeBase] = None
+_KNOWLEDGE_BASE_LOCK = threading.Lock()
+
+
+def get_knowledge_base() -> TranslatorKnowledgeBase:
+    """Return the process-wide knowledge base, building it on first use."""
+    global _KNOWLEDGE_BASE
+    if _KNOWLEDGE_BASE is None:
+        with _KNOWLEDGE_BASE_LOCK:
+            if _KNOWLEDGE_BASE is None:
+                _KNOWLEDGE_BASE = TranslatorKnowledgeBase()
+    return _KNOWLEDGE_BASE
+
+
+class SegmentCache:
+    """Thread-safe LRU cache of translated segments bounded by entry count and size.
+
+    Sizes are measured with sys.getsizeof on the key text and the cached value,
+    so max_bytes approximates the memory actually held by the cache.
+    """
+
+    def __init__(self, max_entries: int = 50000, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries: "OrderedDict[Tuple, Tuple[str, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Tuple) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: Tuple, value: str) -> None:
+        size = sys.getsizeof(key[0]) + sys.getsizeof(value)
+        if self.max_entries <= 0 or size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= previous[1]
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+            while len(self._entries) > self.max_entries or self.current_bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+
+SEGMENT_CACHE = SegmentCache()
+
+
+def _file_digest(path: Path) -> str:
+    """SHA-256 of a file's bytes, or an empty string if it does not exist."""
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return ""
+
+
+class EnhancementManifest:
+    """Records what produced each -ar.md so unchanged pairs can be skipped.
+
+    Each entry maps the Arabic file (relative to the docs root) to the hash of
+    its English source, the translator version and the hash of the output we
+    wrote. A pair is current when all three still match.
+    """
+
+    FILENAME = ".enhance_manifest.json"
+
+    def __init__(self, docs_root: Path):
+        self.docs_root = docs_root
+        self.path = docs_root / self.FILENAME
+        self.entries: Dict[str, Dict[str, str]] = {}
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f).get("files", {})
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable manifest {self.path}: {e}")
+
+    def _key(self, arabic_file_path: Path) -> str:
+        try:
+            return str(arabic_file_path.resolve().relative_to(self.docs_root))
+        except ValueError:
+            return str(arabic_file_path.resolve())
+
+    @staticmethod
+    def english_path(arabic_file_path: Path) -> Path:
+        return arabic_file_path.parent / arabic_file_path.name.replace('-ar.md', '.md')
+
+    def is_current(self, arabic_file_path: Path, version: str) -> bool:
+        entry = self.entries.get(self._key(arabic_file_path))
+        if not entry or entry.get("version") != version:
+            return False
+        return (entry.get("source_hash") == _file_digest(self.english_path(arabic_file_path))
+                and entry.get("output_hash") == _file_digest(arabic_file_path))
+
+    def record(self, arabic_file_path: Path, version: str) -> None:
+        self.entries[self._key(arabic_file_path)] = {
+            "source_hash": _file_digest(self.english_path(arabic_file_path)),
+            "version": version,
+            "output_hash": _file_digest(arabic_file_path),
         }
+
+    def save(self) -> None:
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"updated": datetime.now().isoformat(), "files": self.entries}, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+class LocalAITranslator:
+    """Advanced local translator with AI-like intelligence"""
     
-    def setup_content_patterns(self):
-        """Content structure and pattern recognition"""
+    def __init__(self, docs_root: Optional[str] = None, aggressive: bool = False, arabic_only: bool = False,
+                 segment_cache: Optional["SegmentCache"] = None, use_translation_memory: bool = True,
+                 force: bool = False, jobs: int = 1, stats_level: str = "counters"):
+        # Resolve docs_root relative to this script if not absolute
+        script_dir = Path(__file__).parent
+        if docs_root is None:
+            self.docs_root = (script_dir / "docs").resolve()
+        else:
+            candidate = Path(docs_root)
+            self.docs_root = (candidate if candidate.is_absolute() else (script_dir / candidate)).resolve()
+        self.content_root = self.docs_root / "content"
+        self.aggressive = aggressive
+        self.arabic_only = arabic_only
+        self.fallback_threshold = 0.6 if aggressive else 0.25
+        # Bulk runs skip pairs whose inputs are unchanged unless forced
+        self.force = force
+        self._manifest: Optional[EnhancementManifest] = None
+        self.jobs = max(1, jobs)
+        self.use_translation_memory = use_translation_memory
         
-        self.content_patterns = {
-            # Common GitHub documentation patterns
-            "introduction_patterns": [
-                (r'^## About (.+)', r'## حول \1'),
-                (r'^### What is (.+)\?', r'### ما هو \1؟'),
-                (r'^### Why (.+)\?', r'### لماذا \1؟'),
-                (r'^### How (.+)', r'### كيف \1'),
-                (r'^### When (.+)', r'### متى \1')
-            ],
-            
-            "instruction_patterns": [
-                (r'^### Step (\d+):', r'### الخطوة \1:'),
-                (r'^#### Prerequisites', r'#### المتطلبات المسبقة'),
-                (r'^#### Requirements', r'#### المتطلبات'),
-                (r'^#### Before you begin', r'#### قبل أن تبدأ'),
-                (r'^### Next steps', r'### الخطوات التالية')
-            ],
-            
-            "navigation_patterns": [
-                (r'In this article', r'في هذا المقال'),
-                (r'Table of contents', r'جدول المحتويات'),
-                (r'See also', r'انظر أيضًا'),
-                (r'Related articles', r'المقالات ذات الصلة'),
-                (r'Further reading', r'قراءة إضافية')
-            ]
-        }
-    
-    def setup_github_domain_knowledge(self):
-        """GitHub-specific domain knowledge and context"""
+        # Shared, read-only translation databases (built once per process)
+        self.kb = get_knowledge_base()
+        # Translated segments are cached process-wide unless a cache is given
+        self.segment_cache = segment_cache if segment_cache is not None else SEGMENT_CACHE
+        # Durable translation memory under the docs root (skipped if the root is missing)
+        self.translation_memory = (
+            open_translation_memory(self.docs_root / TM_FILENAME) if use_translation_memory else None
+        )
+        self.tm_engine = "local" + ("-aggressive" if aggressive else "") + ("-arabic-only" if arabic_only else "")
         
-        self.github_contexts = {
-            # Product names (keep in English with Arabic explanation)
-            "products": {
-                "GitHub Desktop": "GitHub Desktop",
-                "GitHub CLI": "GitHub CLI",
-                "GitHub Mobile": "GitHub Mobile", 
-                "GitHub Codespaces": "GitHub Codespaces",
-                "GitHub Copilot": "GitHub Copilot",
-                "GitHub Actions": "GitHub Actions",
-                "GitHub Pages": "GitHub Pages",
-                "GitHub Packages": "GitHub Packages"
-            },
-            
-            # Feature explanations
-            "feature_explanations": {
-                "GitHub Desktop": "تطبيق سطح المكتب لـ GitHub",
-                "GitHub CLI": "واجهة سطر الأوامر لـ GitHub", 
-                "Codespaces": "بيئات التطوير السحابية",
-                "Copilot": "مساعد البرمجة بالذكاء الاصطناعي",
-                "Actions": "أتمتة سير العمل والتكامل المستمر",
-                "Pages": "استضافة المواقع الثابتة",
-                "Packages": "إدارة وتوزيع الحزم"
-            },
-            
-            # Common workflows
-            "workflows": {
-                "fork_and_pull": "النسخ المتفرع وطلب السحب",
-                "gitflow": "سير عمل Git",
-                "feature_branch": "فرع الميزة",
-                "release_management": "إدارة الإصدارات"
-            }
+        # Statistics tracking
+        if stats_level not in STATS_LEVELS:
+            raise ValueError(f"stats_level must be one of {', '.join(STATS_LEVELS)}")
+        self.stats_level = stats_level
+        self._count_stats = stats_level != "off"
+        self._detailed_stats = stats_level == "detailed"
+        self.stats = self._new_stats()
+
+    def _new_stats(self) -> Dict:
+        stats = {
+            "files_processed": 0,
+            "translations_enhanced": 0,
+            "terminology_applications": 0,
+            "pattern_matches": 0,
+            "linguistic_improvements": 0,
+            "segment_cache_hits": 0,
+            "segment_cache_misses": 0,
+            "tm_hits": 0,
+            "tm_misses": 0,
+            "files_skipped_unchanged": 0,
+            "segments_deduplicated": 0
         }
-    
+        if self._detailed_stats:
+            stats["timings"] = {}  # stage -> seconds
+            stats["term_counts"] = {}  # term -> substitutions
+        return stats
+
+    def _time_stage(self, stage: str, started: float) -> float:
+        """Add the time since started to a stage timing; returns the current time"""
+        now = perf_counter()
+        timings = self.stats["timings"]
+        timings[stage] = timings.get(stage, 0.0) + (now - started)
+        return now
+
+    @property
+    def enhance_version(self) -> str:
+        """Identifies the translator configuration that produced an output file"""
+        return f"{self.tm_engine}:{self.kb.version}"
+
+    @property
+    def manifest(self) -> EnhancementManifest:
+        if self._manifest is None:
+            self._manifest = EnhancementManifest(self.docs_root)
+        return self._manifest
+
+    @property
+    def terminology(self):
+        return self.kb.terminology
+
+    @property
+    def reverse_terminology(self):
+        return self.kb.reverse_terminology
+
+    @property
+    def linguistic_rules(self):
+        return self.kb.linguistic_rules
+
+    @property
+    def content_patterns(self):
+        return self.kb.content_patterns
+
+    @property
+    def github_contexts(self):
+        return self.kb.github_contexts
+
+    @property
+    def lexical_map(self):
+        return self.kb.lexical_map
+
+    def _arabic_ratio(self, text: str) -> float:
+        return arabic_ratio(text)
+
+    def _apply_lexical_fallback(self, text: str) -> str:
+        # Apply word-level replacements conservatively with word boundaries
+        return self.kb.lexical_engine.apply(text)
+
     def extract_frontmatter(self, content):
         """Extract YAML frontmatter from markdown content"""
         if not content.strip().startswith('---'):
@@ -702,174 +1058,162 @@ class LocalAITranslator:
         if not text or not text.strip():
             return text
         
-        # Preserve liquid tags and technical elements using stable placeholders
-        temp_text = text
-        preserved: List[Tuple[str, str]] = []  # (placeholder, original)
-        
-        def make_replacer(kind: str):
-            def _repl(m: re.Match) -> str:
-                placeholder = f"__PRESERVE_{kind}_{len(preserved)}__"
-                preserved.append((placeholder, m.group(0)))
-                return placeholder
-            return _repl
-        
-        # Preserve liquid tags first
-        liquid_pattern = r'({%[^%]*%}|{{[^}]*}})'
-        temp_text = re.sub(liquid_pattern, make_replacer("LIQUID"), temp_text)
-        
-        # Preserve inline code snippets
-        code_pattern = r'`[^`]+`'
-        temp_text = re.sub(code_pattern, make_replacer("CODE"), temp_text)
-
-        # Apply terminology translations
-        for english, arabic in self.terminology.items():
-            # Case-insensitive replacement with word boundaries
-            pattern = r'\b' + re.escape(english) + r'\b'
-            temp_text = re.sub(pattern, arabic, temp_text, flags=re.IGNORECASE)
-            self.stats["terminology_applications"] += temp_text.count(arabic)
-
-        # Apply linguistic rules
-        for rule_category, rules in self.linguistic_rules.items():
-            if rule_category == "technical_context":
-                continue  # Skip technical context in this phase
-
-            if isinstance(rules, dict) and "patterns" in rules:
-                for pattern, replacement in rules["patterns"]:
-                    if re.search(pattern, temp_text):
-                        temp_text = re.sub(pattern, replacement, temp_text)
-                        self.stats["pattern_matches"] += 1
+        count = self._count_stats
+        cache_key = (text, self.aggressive, self.arabic_only, self.kb.version)
+        cached = self.segment_cache.get(cache_key)
+        if cached is not None:
+            if count:
+                self.stats["segment_cache_hits"] += 1
+            return cached
+        if count:
+            self.stats["segment_cache_misses"] += 1
+        
+        tm = self.translation_memory
+        result = None
+        if tm is not None:
+            started = perf_counter() if self._detailed_stats else 0.0
+            result = tm.lookup(self.tm_engine, self.kb.version, text)
+            if self._detailed_stats:
+                self._time_stage("tm_lookup", started)
+        if result is not None:
+            if count:
+                self.stats["tm_hits"] += 1
+        else:
+            result = self._translate_segment(text)
+            if tm is not None:
+                if count:
+                    self.stats["tm_misses"] += 1
+                tm.store(self.tm_engine, self.kb.version, text, result)
+        self.segment_cache.put(cache_key, result)
+        return result
+    
+    def translate_batch(self, segments):
+        """Translate a list of segments, each distinct segment only once
+        
+        Returns the translations in input order; repeated table rows and
+        list phrasing within a document are translated a single time.
+        """
+        
+        slots: Dict[str, int] = {}
+        order = [slots.setdefault(segment, len(slots)) for segment in segments]
+        if self._count_stats:
+            self.stats["segments_deduplicated"] += len(order) - len(slots)
+        translated = [self.translate_text_intelligent(segment) for segment in slots]
+        return [translated[i] for i in order]
+    
+    def _translate_segment(self, text):
+        """Translate one segment through the full pipeline (uncached)"""
+        
+        detailed = self._detailed_stats
+        started = perf_counter() if detailed else 0.0
+
+        # Preserve liquid, inline code, link targets, URLs and HTML in one pass
+        temp_text, preserved = protect(text)
+        if detailed:
+            started = self._time_stage("protect", started)
+
+        # Apply terminology translations (case-insensitive, longest match wins)
+        temp_text, applied = self.kb.term_matcher.sub(temp_text, self.stats["term_counts"] if detailed else None)
+        if detailed:
+            started = self._time_stage("terminology", started)
+
+        # Apply linguistic rules (technical context is skipped in this phase)
+        matched_rules = 0
+        for pattern, replacement in self.kb.linguistic_patterns:
+            temp_text, matched = pattern.subn(replacement, temp_text)
+            if matched:
+                matched_rules += 1
+        if self._count_stats:
+            self.stats["terminology_applications"] += applied
+            self.stats["pattern_matches"] += matched_rules
+        if detailed:
+            started = self._time_stage("linguistic", started)
 
         # If text still predominantly English, apply lexical fallback
-        if self._arabic_ratio(temp_text) < self.fallback_threshold and len(re.findall(r"[A-Za-z]", temp_text)) > 50:
+        histogram = script_histogram(temp_text)
+        if histogram.arabic_ratio < self.fallback_threshold and histogram.latin > 50:
             temp_text = self._apply_lexical_fallback(temp_text)
+        if detailed:
+            started = self._time_stage("lexical_fallback", started)
 
-        # Either restore preserved elements or drop them for Arabic-only output
+        # Typography runs on the masked text so restore() is the last step and
+        # preserved elements come back untouched; Arabic-only output drops them
         if self.arabic_only:
-            for placeholder, _ in preserved:
-                temp_text = temp_text.replace(placeholder, "")
-            return self._arabic_only_cleanup(temp_text)
+            result = arabic_only_cleanup(restore(temp_text, preserved, drop=True))
         else:
-            for placeholder, original in preserved:
-                temp_text = temp_text.replace(placeholder, original)
-            return self._arabic_typography(temp_text)
+            result = restore(arabic_typography(temp_text), preserved)
+        if detailed:
+            self._time_stage("restore_postprocess", started)
+        return result
     
     def generate_enhanced_content(self, original_content, frontmatter):
         """Generate enhanced Arabic content from English original"""
         
+        return "".join(self.iter_enhanced_content(original_content, frontmatter))
+    
+    def iter_enhanced_content(self, original_content, frontmatter):
+        """Yield the enhanced Arabic document section by section
+        
+        Lets callers write straight to a file or response without holding
+        the whole rendered document in memory.
+        """
+        
         # Start with Arabic header
-        enhanced_content = f"# {frontmatter.get('title', 'مستند GitHub')}\n\n"
+        yield f"# {frontmatter.get('title', 'مستند GitHub')}\n\n"
         
         # Add context-aware introduction
         if 'intro' in frontmatter:
-            enhanced_content += f"{frontmatter['intro']}\n\n"
+            yield f"{frontmatter['intro']}\n\n"
         
-        # Analyze content structure
-        sections = self.analyze_content_structure(original_content)
-        
-        # Generate intelligent Arabic content based on structure
-        for section in sections:
-            if section['type'] == 'heading':
-                level = '#' * section['level']
-                translated_heading = self.translate_text_intelligent(section['content'])
-                enhanced_content += f"{level} {translated_heading}\n\n"
-                
-            elif section['type'] == 'paragraph':
-                if section['content'].strip():
-                    translated_paragraph = self.translate_text_intelligent(section['content'])
-                    enhanced_content += f"{translated_paragraph}\n\n"
-                    
-            elif section['type'] == 'list':
-                for item in section['items']:
-                    translated_item = self.translate_text_intelligent(item)
-                    enhanced_content += f"- {translated_item}\n"
-                enhanced_content += "\n"
-                
-            elif section['type'] == 'code_block':
-                enhanced_content += f"```{section.get('language', '')}\n{section['content']}\n```\n\n"
-                
-            elif section['type'] == 'quote':
-                translated_quote = self.translate_text_intelligent(section['content'])
-                enhanced_content += f"> {translated_quote}\n\n"
+        yield from self.iter_translated_blocks(original_content)
         
         # Add helpful Arabic navigation
-        enhanced_content += "\n---\n\n"
-        enhanced_content += "## مصادر إضافية\n\n"
-        enhanced_content += "- [المستندات الرئيسية لـ GitHub](https://docs.github.com/ar)\n"
-        enhanced_content += "- [مجتمع GitHub باللغة العربية](https://github.com/community)\n"
-        enhanced_content += "- [الدعم الفني](https://support.github.com)\n"
+        yield ("\n---\n\n"
+               "## مصادر إضافية\n\n"
+               "- [المستندات الرئيسية لـ GitHub](https://docs.github.com/ar)\n"
+               "- [مجتمع GitHub باللغة العربية](https://github.com/community)\n"
+               "- [الدعم الفني](https://support.github.com)\n")
+    
+    def iter_translated_blocks(self, content):
+        """Yield each Markdown block of content with its text spans translated"""
         
-        return enhanced_content
+        # Tokenize into blocks and translate only their text spans, batched
+        # over windows of about BATCH_WINDOW_SEGMENTS so output keeps streaming;
+        # code, HTML and markup around the spans are copied verbatim
+        window = []
+        segments = []
+        for block in self.analyze_content_structure(content):
+            window.append(block)
+            segments.extend(block.segments(content))
+            if len(segments) >= BATCH_WINDOW_SEGMENTS:
+                yield from self._render_window(content, window, segments)
+                window, segments = [], []
+        if window:
+            yield from self._render_window(content, window, segments)
     
-    def analyze_content_structure(self, content):
-        """Analyze content structure for intelligent processing"""
+    def _render_window(self, content, blocks, segments):
+        translations = iter(self.translate_batch(segments))
+        for block in blocks:
+            yield block.render(content, lambda _: next(translations)) + "\n\n"
+    
+    def translate_markdown(self, content):
+        """Translate a Markdown fragment (no page header or footer), post-processed"""
         
-        sections = []
-        lines = content.split('\n')
+        return "".join(self.postprocess_stream(self.iter_translated_blocks(content))).rstrip("\n") + "\n"
+    
+    def postprocess_stream(self, chunks):
+        """Apply final Arabic post-processing to a stream of rendered sections"""
         
-        i = 0
-        while i < len(lines):
-            line = lines[i].strip()
-            
-            # Skip empty lines
-            if not line:
-                i += 1
-                continue
-            
-            # Heading detection
-            if line.startswith('#'):
-                level = len(line) - len(line.lstrip('#'))
-                heading_text = line.lstrip('#').strip()
-                sections.append({
-                    'type': 'heading',
-                    'level': level,
-                    'content': heading_text
-                })
-                
-            # Code block detection
-            elif line.startswith('```'):
-                language = line[3:].strip()
-                code_content = []
-                i += 1
-                while i < len(lines) and not lines[i].strip().startswith('```'):
-                    code_content.append(lines[i])
-                    i += 1
-                sections.append({
-                    'type': 'code_block',
-                    'language': language,
-                    'content': '\n'.join(code_content)
-                })
-                
-            # List detection
-            elif line.startswith(('-', '*', '+')):
-                list_items = []
-                while i < len(lines) and lines[i].strip().startswith(('-', '*', '+')):
-                    item_text = lines[i].strip()[1:].strip()
-                    list_items.append(item_text)
-                    i += 1
-                i -= 1  # Adjust for the increment at the end of the loop
-                sections.append({
-                    'type': 'list',
-                    'items': list_items
-                })
-                
-            # Quote detection
-            elif line.startswith('>'):
-                quote_text = line[1:].strip()
-                sections.append({
-                    'type': 'quote',
-                    'content': quote_text
-                })
-                
-            # Regular paragraph
-            else:
-                sections.append({
-                    'type': 'paragraph',
-                    'content': line
-                })
-            
-            i += 1
+        return ArabicPostProcessor(arabic_only=self.arabic_only).stream(chunks)
+    
+    def analyze_content_structure(self, content):
+        """Analyze content structure for intelligent processing
+        
+        Returns markdown_blocks.Block objects (headings, paragraphs, lists,
+        code, quotes, tables, HTML) that reference content by offset.
+        """
         
-        return sections
+        return tokenize_blocks(content)
     
     def enhance_translation_file(self, arabic_file_path):
         """Enhance an existing Arabic translation file"""
@@ -901,23 +1245,28 @@ class LocalAITranslator:
             # Enhance frontmatter
             enhanced_frontmatter = self.enhance_frontmatter(frontmatter)
             
-            # Generate enhanced content
-            enhanced_content = self.generate_enhanced_content(english_body, enhanced_frontmatter)
-            
-            # Construct final file content
-            final_content = "---\n"
+            # Construct frontmatter header
+            header = "---\n"
             for key, value in enhanced_frontmatter.items():
                 # Preserve array and complex values
                 if isinstance(value, (list, dict)):
-                    final_content += f"{key}: {value}\n"
+                    header += f"{key}: {value}\n"
                 else:
-                    final_content += f"{key}: {value}\n"
-            final_content += "---\n\n"
-            final_content += (self._arabic_only_cleanup(enhanced_content) if self.arabic_only else self._arabic_typography(enhanced_content))
+                    header += f"{key}: {value}\n"
+            header += "---\n\n"
             
-            # Write enhanced content
-            with open(arabic_file_path, 'w', encoding='utf-8') as f:
-                f.write(final_content)
+            # Stream enhanced content to a temp file, then atomically replace
+            tmp_path = arabic_file_path.with_name(arabic_file_path.name + ".tmp")
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    f.write(header)
+                    sections = self.iter_enhanced_content(english_body, enhanced_frontmatter)
+                    for chunk in self.postprocess_stream(sections):
+                        f.write(chunk)
+                os.replace(tmp_path, arabic_file_path)
+            finally:
+                if tmp_path.exists():
+                    tmp_path.unlink()
             
             self.stats["files_processed"] += 1
             self.stats["translations_enhanced"] += 1
@@ -929,6 +1278,89 @@ class LocalAITranslator:
             logger.error(f"Error enhancing {arabic_file_path}: {e}")
             return False
     
+    def warm_translation_memory(self, top_n):
+        """Pretranslate the most frequent corpus segments before fanning out
+        
+        Workers then find those segments in the translation memory instead
+        of each translating them independently.
+        """
+        
+        if self.translation_memory is None:
+            logger.warning("Translation memory disabled; skipping cache warm-up")
+            return 0
+        index = build_segment_index(self.content_root)
+        count = pretranslate(self, index, top_n)
+        logger.info(f"Warmed translation memory with {count} segments "
+                    f"({index.coverage(top_n) * 100:.1f}% of corpus bytes)")
+        return count
+    
+    def emit_reusables(self):
+        """Translate every data/reusables fragment once and write <name>-ar.md next to it"""
+        
+        index = ReusableIndex(self.docs_root)
+        counts = translate_reusables(self, index, emit=True)
+        logger.info(f"Reusables: {counts['translated']} translated, {counts['cached']} reused from cache, "
+                    f"{counts['emitted']} files written")
+        return counts
+    
+    def _enhance_files(self, arabic_files, progress_every=0):
+        """Enhance files whose inputs changed since the manifest was written"""
+        
+        version = self.enhance_version
+        manifest = self.manifest
+        if self.force:
+            pending = list(arabic_files)
+        else:
+            pending = [p for p in arabic_files if not manifest.is_current(p, version)]
+            skipped = len(arabic_files) - len(pending)
+            self.stats["files_skipped_unchanged"] += skipped
+            if skipped:
+                logger.info(f"Skipping {skipped} unchanged files (use --force to regenerate)")
+        
+        if self.jobs > 1 and len(pending) > 1:
+            results = self._enhance_in_pool(pending)
+        else:
+            results = ((file_path, self.enhance_translation_file(file_path)) for file_path in pending)
+        
+        enhanced_count = 0
+        for i, (file_path, ok) in enumerate(results):
+            if progress_every and i and i % progress_every == 0:
+                logger.info(f"Progress: {i}/{len(pending)} files processed...")
+            
+            if ok:
+                manifest.record(file_path, version)
+                enhanced_count += 1
+                if enhanced_count % 100 == 0:
+                    manifest.save()
+        
+        manifest.save()
+        return enhanced_count
+    
+    def _enhance_in_pool(self, arabic_files):
+        """Enhance files across worker processes, yielding (path, ok) in schedule order
+        
+        Files are scheduled largest English source first so big pages do not
+        straggle at the end. Worker log records are buffered per file and
+        replayed here, and per-file stats deltas are merged into self.stats.
+        """
+        
+        def source_size(path):
+            try:
+                return EnhancementManifest.english_path(path).stat().st_size
+            except OSError:
+                return 0
+        
+        ordered = sorted(arabic_files, key=source_size, reverse=True)
+        logger.info(f"Distributing {len(ordered)} files across {self.jobs} worker processes...")
+        initargs = (str(self.docs_root), self.aggressive, self.arabic_only, self.use_translation_memory,
+                    self.stats_level)
+        with ProcessPoolExecutor(max_workers=self.jobs, initializer=_init_pool_worker, initargs=initargs) as pool:
+            for path_str, ok, stats_delta, records in pool.map(_enhance_in_pool_worker, map(str, ordered)):
+                for level, message in records:
+                    logger.log(level, message)
+                _merge_stats(self.stats, stats_delta)
+                yield Path(path_str), ok
+    
     def enhance_sample_files(self, sample_size=5):
         """Enhance a sample of files for testing"""
         
@@ -945,10 +1377,7 @@ class LocalAITranslator:
         import random
         sample_files = random.sample(arabic_files, min(sample_size, len(arabic_files)))
         
-        enhanced_count = 0
-        for file_path in sample_files:
-            if self.enhance_translation_file(file_path):
-                enhanced_count += 1
+        enhanced_count = self._enhance_files(sample_files)
         
         logger.info(f"Enhanced {enhanced_count}/{sample_size} sample files")
         self.print_enhancement_stats()
@@ -977,10 +1406,7 @@ class LocalAITranslator:
         
         logger.info(f"Enhancing {len(priority_files)} priority files...")
         
-        enhanced_count = 0
-        for file_path in priority_files:
-            if self.enhance_translation_file(file_path):
-                enhanced_count += 1
+        enhanced_count = self._enhance_files(priority_files)
         
         logger.info(f"Enhanced {enhanced_count}/{len(priority_files)} priority files")
         self.print_enhancement_stats()
@@ -994,13 +1420,7 @@ class LocalAITranslator:
         
         logger.info(f"Enhancing all {len(arabic_files)} Arabic files...")
         
-        enhanced_count = 0
-        for i, file_path in enumerate(arabic_files):
-            if i % 100 == 0:
-                logger.info(f"Progress: {i}/{len(arabic_files)} files processed...")
-            
-            if self.enhance_translation_file(file_path):
-                enhanced_count += 1
+        enhanced_count = self._enhance_files(arabic_files, progress_every=100)
         
         logger.info(f"Enhanced {enhanced_count}/{len(arabic_files)} files")
         self.print_enhancement_stats()
@@ -1014,9 +1434,21 @@ class LocalAITranslator:
         print("=" * 45)
         print(f"Files Processed: {self.stats['files_processed']}")
         print(f"Translations Enhanced: {self.stats['translations_enhanced']}")
+        if self.stats['files_skipped_unchanged']:
+            print(f"Skipped (unchanged): {self.stats['files_skipped_unchanged']}")
         print(f"Terminology Applications: {self.stats['terminology_applications']}")
         print(f"Pattern Matches: {self.stats['pattern_matches']}")
         print(f"Linguistic Improvements: {self.stats['linguistic_improvements']}")
+        if self.stats['segments_deduplicated']:
+            print(f"Duplicate Segments Reused: {self.stats['segments_deduplicated']}")
+        lookups = self.stats['segment_cache_hits'] + self.stats['segment_cache_misses']
+        if lookups:
+            hit_rate = self.stats['segment_cache_hits'] / lookups * 100
+            print(f"Segment Cache Hits: {self.stats['segment_cache_hits']}/{lookups} ({hit_rate:.1f}%)")
+        tm_lookups = self.stats['tm_hits'] + self.stats['tm_misses']
+        if tm_lookups:
+            tm_rate = self.stats['tm_hits'] / tm_lookups * 100
+            print(f"Translation Memory Hits: {self.stats['tm_hits']}/{tm_lookups} ({tm_rate:.1f}%)")
         
         # Calculate enhancement metrics
         if self.stats['files_processed'] > 0:
@@ -1027,8 +1459,66 @@ class LocalAITranslator:
             ) / self.stats['files_processed']
             print(f"Average Improvements per File: {avg_improvements:.1f}")
         
+        if self._detailed_stats:
+            timings = self.stats["timings"]
+            if timings:
+                print("\nStage Timings:")
+                for stage, seconds in sorted(timings.items(), key=lambda item: item[1], reverse=True):
+                    print(f"  {stage}: {seconds:.3f}s")
+            term_counts = self.stats["term_counts"]
+            if term_counts:
+                print("\nTop Terms:")
+                for term, hits in sorted(term_counts.items(), key=lambda item: item[1], reverse=True)[:10]:
+                    print(f"  {term}: {hits}")
+        
         print("\n✅ Local AI Enhancement Complete!")
 
+class _BufferedLogHandler(logging.Handler):
+    """Collects log records in a worker so the parent can replay them in order"""
+    
+    def __init__(self):
+        super().__init__()
+        self.records: List[Tuple[int, str]] = []
+    
+    def emit(self, record):
+        self.records.append((record.levelno, record.getMessage()))
+
+
+def _merge_stats(target: Dict, delta: Dict) -> None:
+    """Add a stats delta into target, recursing into nested counters and timings"""
+    for key, value in delta.items():
+        if isinstance(value, dict):
+            _merge_stats(target.setdefault(key, {}), value)
+        else:
+            target[key] = target.get(key, 0) + value
+
+
+_POOL_TRANSLATOR: Optional[LocalAITranslator] = None
+_POOL_LOG: Optional[_BufferedLogHandler] = None
+
+
+def _init_pool_worker(docs_root, aggressive, arabic_only, use_translation_memory, stats_level):
+    global _POOL_TRANSLATOR, _POOL_LOG
+    _POOL_LOG = _BufferedLogHandler()
+    logger.addHandler(_POOL_LOG)
+    logger.propagate = False
+    _POOL_TRANSLATOR = LocalAITranslator(docs_root=docs_root, aggressive=aggressive, arabic_only=arabic_only,
+                                         use_translation_memory=use_translation_memory,
+                                         stats_level=stats_level)
+
+
+def _enhance_in_pool_worker(path_str):
+    translator = _POOL_TRANSLATOR
+    # Start each file from zero so the returned stats are exactly this file's delta
+    translator.stats = translator._new_stats()
+    _POOL_LOG.records = []
+    ok = translator.enhance_translation_file(Path(path_str))
+    # Pool workers exit without running atexit hooks, so commit per file
+    if translator.translation_memory is not None:
+        translator.translation_memory.flush()
+    return path_str, ok, translator.stats, _POOL_LOG.records
+
+
 def main():
     """Main function with command line interface"""
     
@@ -1042,11 +1532,22 @@ def main():
     parser.add_argument("--root", type=str, help="Path to docs root (directory that contains 'content')")
     parser.add_argument("--aggressive", action="store_true", help="Use aggressive lexical fallback for stubborn files")
     parser.add_argument("--arabic-only", action="store_true", help="Output Arabic-only text (strip English/code/URLs)")
+    parser.add_argument("--no-tm", action="store_true", help="Do not read or write the persistent translation memory")
+    parser.add_argument("--force", action="store_true", help="Regenerate files even if source and translator are unchanged")
+    parser.add_argument("--jobs", type=int, default=1, help="Number of worker processes for bulk enhancement")
+    parser.add_argument("--warm", type=int, default=0,
+                        help="Pretranslate the N most frequent corpus segments before a bulk run")
+    parser.add_argument("--emit-reusables", action="store_true",
+                        help="Translate data/reusables once (cached by content hash) and write <name>-ar.md files")
+    parser.add_argument("--stats", choices=STATS_LEVELS, default="counters",
+                        help="Statistics to collect: off, counters, or detailed (per-stage timings and term counts)")
     
     args = parser.parse_args()
     
     # Initialize local AI translator
-    translator = LocalAITranslator(docs_root=args.root, aggressive=args.aggressive, arabic_only=args.arabic_only)
+    translator = LocalAITranslator(docs_root=args.root, aggressive=args.aggressive, arabic_only=args.arabic_only,
+                                   use_translation_memory=not args.no_tm, force=args.force,
+                                   jobs=args.jobs, stats_level=args.stats)
     
     print("🤖 LOCAL AI-ENHANCED TRANSLATOR")
     print("=" * 40)
@@ -1055,14 +1556,24 @@ def main():
     print("✅ Advanced linguistic intelligence!")
     print("✅ Comprehensive terminology database!")
     
+    if args.warm and not args.file:
+        translator.warm_translation_memory(args.warm)
+    
     if args.file:
         translator.enhance_translation_file(Path(args.file))
     elif args.all:
         translator.enhance_all_files()
     elif args.priority:
         translator.enhance_priority_files()
-    else:
+    elif not (args.warm or args.emit_reusables):
+        # Sample run only when no other action was requested
         translator.enhance_sample_files(args.sample)
 
+    if args.emit_reusables:
+        translator.emit_reusables()
+
+    if translator.translation_memory is not None:
+        translator.translation_memory.flush()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Markdown Block Tokenizer
+
+Single-pass, line-oriented block tokenizer for GitHub docs Markdown bodies.
+Blocks are compact __slots__ objects holding source offsets rather than
+copied strings; each block also records the spans of its translatable text
+(heading text, paragraph, list item, quote line, table cell) so callers can
+translate just those spans and rebuild the block verbatim around them.
+
+Recognized blocks:
+- ATX headings
+- Paragraphs (consecutive lines, including lines that only hold liquid tags)
+- Bullet and numbered lists, including nested items and continuation lines
+- Fenced code blocks (``` and ~~~) and indented code blocks
+- Block quotes (GitHub alert markers such as [!NOTE] are left untouched)
+- Pipe tables
+- HTML blocks and thematic breaks (passed through verbatim)
+
+chunk_markdown() groups blocks into chunks under a token budget for LLM
+requests, cutting only between blocks and outside liquid block tags.
+"""
+
+import re
+from typing import Callable, Iterator, List, Optional, Tuple
+
+ATX_HEADING = re.compile(r" {0,3}(#{1,6})(?:[ \t]+|$)")
+FENCE_OPEN = re.compile(r"[ \t]*(`{3,}|~{3,})(.*)$")
+LIST_ITEM = re.compile(r"([ \t]*)([-*+]|\d{1,9}[.)])([ \t]+|$)")
+QUOTE = re.compile(r" {0,3}>[ \t]?")
+TABLE_DELIMITER = re.compile(r"[ \t]*\|?[ \t]*:?-+:?[ \t]*(?:\|[ \t]*:?-+:?[ \t]*)*\|?[ \t]*$")
+THEMATIC_BREAK = re.compile(r" {0,3}([-*_])(?:[ \t]*\1){2,}[ \t]*$")
+HTML_BLOCK = re.compile(
+    r" {0,3}(?:<!--|</?(?:address|article|aside|blockquote|br|details|dialog|div|dl|figure|footer|form|"
+    r"h[1-6]|header|hr|img|li|nav|ol|p|picture|pre|section|summary|table|tbody|td|th|thead|tr|ul)\b"
+    r"|</?[A-Za-z][\w-]*(?:\s[^>]*)?/?>[ \t]*$)",
+    re.IGNORECASE,
+)
+ALERT_MARKER = re.compile(r"\[![A-Z]+\]$")
+INDENTED_CODE = re.compile(r"(?: {4}|\t)")
+CLOSING_HASHES = re.compile(r"[ \t]+#+[ \t]*$")
+
+# Liquid tags that open a block closed by a matching {% end... %}
+LIQUID_BLOCK_TAGS = frozenset({
+    "if", "ifversion", "unless", "for", "case", "raw", "capture", "comment",
+    "note", "tip", "warning", "danger", "caution", "important", "rowheaders",
+})
+LIQUID_TAG = re.compile(r"{%-?\s*(end)?([a-z]+)")
+
+
+class Block:
+    """One Markdown block: kind, [start, end) offsets and translatable spans"""
+
+    __slots__ = ("kind", "start", "end", "level", "info", "spans")
+
+    def __init__(self, kind: str, start: int, end: int, level: int = 0, info: str = "",
+                 spans: Tuple[Tuple[int, int], ...] = ()):
+        self.kind = kind
+        self.start = start
+        self.end = end
+        self.level = level
+        self.info = info
+        self.spans = spans
+
+    def __repr__(self) -> str:
+        return f"Block({self.kind!r}, {self.start}, {self.end}, spans={len(self.spans)})"
+
+    def text(self, source: str) -> str:
+        return source[self.start:self.end]
+
+    def segments(self, source: str) -> Iterator[str]:
+        """Yield the translatable text of each span"""
+        for start, end in self.spans:
+            yield source[start:end]
+
+    def render(self, source: str, translate: Callable[[str], str]) -> str:
+        """Rebuild the block with every span passed through translate"""
+        if not self.spans:
+            return source[self.start:self.end]
+        out: List[str] = []
+        pos = self.start
+        for start, end in self.spans:
+            out.append(source[pos:start])
+            out.append(translate(source[start:end]))
+            pos = end
+        out.append(source[pos:self.end])
+        return "".join(out)
+
+
+def _strip_span(source: str, start: int, end: int) -> Optional[Tuple[int, int]]:
+    """Shrink [start, end) to exclude surrounding whitespace; None if empty"""
+    while start < end and source[start] in " \t":
+        start += 1
+    while end > start and source[end - 1] in " \t\r":
+        end -= 1
+    return (start, end) if start < end else None
+
+
+def _table_cell_spans(source: str, start: int, end: int) -> List[Tuple[int, int]]:
+    spans: List[Tuple[int, int]] = []
+    cell_start = start
+    i = start
+    while i <= end:
+        if i == end or (source[i] == "|" and source[i - 1] != "\\"):
+            span = _strip_span(source, cell_start, i)
+            if span:
+                spans.append(span)
+            cell_start = i + 1
+        i += 1
+    return spans
+
+
+def _is_table_row(line: str) -> bool:
+    return line.lstrip().startswith("|")
+
+
+def tokenize_blocks(source: str) -> List[Block]:
+    """Split a Markdown body into blocks in a single pass over its lines"""
+    # (start, end-without-newline) offsets for every line
+    lines: List[Tuple[int, int]] = []
+    pos = 0
+    length = len(source)
+    while pos < length:
+        nl = source.find("\n", pos)
+        if nl < 0:
+            nl = length
+        lines.append((pos, nl))
+        pos = nl + 1
+
+    def line_at(i: int) -> str:
+        return source[lines[i][0]:lines[i][1]]
+
+    def is_blank(i: int) -> bool:
+        return not line_at(i).strip()
+
+    def starts_block(i: int) -> bool:
+        line = line_at(i)
+        return bool(ATX_HEADING.match(line) or FENCE_OPEN.match(line) or LIST_ITEM.match(line)
+                    or QUOTE.match(line) or HTML_BLOCK.match(line) or _is_table_row(line)
+                    or THEMATIC_BREAK.match(line))
+
+    blocks: List[Block] = []
+    in_list_context = False
+    i = 0
+    n = len(lines)
+    while i < n:
+        line_start, line_end = lines[i]
+        line = line_at(i)
+
+        if not line.strip():
+            i += 1
+            continue
+
+        # Fenced code: runs to a matching closing fence (or end of input)
+        fence = FENCE_OPEN.match(line)
+        if fence:
+            marker = fence.group(1)
+            j = i + 1
+            while j < n:
+                closing = line_at(j).strip()
+                if closing.startswith(marker[0] * len(marker)) and not closing.lstrip(marker[0]).strip():
+                    break
+                j += 1
+            last = min(j, n - 1)
+            blocks.append(Block("code_block", line_start, lines[last][1], info=fence.group(2).strip()))
+            i = last + 1
+            continue
+
+        heading = ATX_HEADING.match(line)
+        if heading:
+            text_end = line_end
+            closing = CLOSING_HASHES.search(line)
+            if closing:
+                text_end = line_start + closing.start()
+            span = _strip_span(source, line_start + heading.end(), text_end)
+            blocks.append(Block("heading", line_start, line_end, level=len(heading.group(1)),
+                                spans=(span,) if span else ()))
+            in_list_context = False
+            i += 1
+            continue
+
+        if THEMATIC_BREAK.match(line):
+            blocks.append(Block("thematic_break", line_start, line_end))
+            in_list_context = False
+            i += 1
+            continue
+
+        if HTML_BLOCK.match(line):
+            comment = line.lstrip().startswith("<!--")
+            j = i
+            while j + 1 < n:
+                if comment and "-->" in line_at(j):
+                    break
+                if not comment and is_blank(j + 1):
+                    break
+                j += 1
+            blocks.append(Block("html", line_start, lines[j][1]))
+            i = j + 1
+            continue
+
+        # Indented code only outside list context, where indentation means continuation
+        if INDENTED_CODE.match(line) and not in_list_context:
+            j = i
+            while j + 1 < n and (INDENTED_CODE.match(line_at(j + 1)) or is_blank(j + 1)):
+                j += 1
+            while j > i and is_blank(j):
+                j -= 1
+            blocks.append(Block("indented_code", line_start, lines[j][1]))
+            i = j + 1
+            continue
+
+        if QUOTE.match(line):
+            spans: List[Tuple[int, int]] = []
+            j = i
+            while j < n:
+                quote = QUOTE.match(line_at(j))
+                if not quote:
+                    break
+                span = _strip_span(source, lines[j][0] + quote.end(), lines[j][1])
+                if span and not ALERT_MARKER.match(source[span[0]:span[1]]):
+                    spans.append(span)
+                j += 1
+            blocks.append(Block("quote", line_start, lines[j - 1][1], spans=tuple(spans)))
+            in_list_context = False
+            i = j
+            continue
+
+        # Pipe tables: leading-pipe rows, or a header row followed by a delimiter row
+        if _is_table_row(line) or ("|" in line and i + 1 < n and TABLE_DELIMITER.match(line_at(i + 1))
+                                   and "-" in line_at(i + 1)):
+            spans = []
+            j = i
+            while j < n and not is_blank(j) and "|" in line_at(j):
+                row = line_at(j)
+                if not (TABLE_DELIMITER.match(row) and "-" in row):
+                    row_start, row_end = lines[j]
+                    stripped = row.strip()
+                    if stripped.startswith("|"):
+                        row_start = row_start + row.index("|") + 1
+                    if stripped.endswith("|") and len(stripped) > 1:
+                        row_end = lines[j][0] + row.rindex("|")
+                    spans.extend(_table_cell_spans(source, row_start, row_end))
+                j += 1
+            blocks.append(Block("table", line_start, lines[j - 1][1], spans=tuple(spans)))
+            in_list_context = False
+            i = j
+            continue
+
+        item = LIST_ITEM.match(line)
+        if item:
+            spans = []
+            ordered = item.group(2)[0].isdigit()
+            j = i
+            while j < n and not is_blank(j):
+                current = LIST_ITEM.match(line_at(j))
+                if current:
+                    span = _strip_span(source, lines[j][0] + current.end(), lines[j][1])
+                    if span:
+                        spans.append(span)
+                elif starts_block(j):
+                    break
+                else:
+                    # Continuation line extends the previous item's text
+                    span = _strip_span(source, lines[j][0], lines[j][1])
+                    if span and spans:
+                        spans[-1] = (spans[-1][0], span[1])
+                    elif span:
+                        spans.append(span)
+                j += 1
+            blocks.append(Block("list", line_start, lines[j - 1][1], info="ordered" if ordered else "bullet",
+                                spans=tuple(spans)))
+            in_list_context = True
+            i = j
+            continue
+
+        # Paragraph: consecutive lines until a blank line or another block starts
+        j = i
+        while j + 1 < n and not is_blank(j + 1) and not starts_block(j + 1):
+            j += 1
+        span = _strip_span(source, line_start, lines[j][1])
+        blocks.append(Block("paragraph", line_start, lines[j][1], spans=(span,) if span else ()))
+        if not INDENTED_CODE.match(line):
+            in_list_context = False
+        i = j + 1
+
+    return blocks
+
+
+def _liquid_depth_change(text: str) -> int:
+    depth = 0
+    for end, name in LIQUID_TAG.findall(text):
+        if name in LIQUID_BLOCK_TAGS:
+            depth += -1 if end else 1
+    return depth
+
+
+def chunk_markdown(source: str, max_tokens: int, estimate: Callable[[str], int]) -> List[str]:
+    """Split a Markdown body into chunks of at most ~max_tokens (per estimate)
+
+    Cuts fall only between blocks, never inside a fenced code block, and only
+    where no liquid block ({% ifversion %}, {% note %}, ...) is open. A single
+    block larger than the budget becomes its own oversized chunk. The chunks
+    concatenate back to source exactly.
+    """
+    blocks = tokenize_blocks(source)
+    if len(blocks) < 2 or estimate(source) <= max_tokens:
+        return [source] if source else []
+
+    chunks: List[str] = []
+    chunk_start = 0
+    chunk_tokens = 0
+    depth = 0
+    prev_end = 0
+    for block in blocks:
+        block_tokens = estimate(source[prev_end:block.end])
+        if depth <= 0 and chunk_tokens and chunk_tokens + block_tokens > max_tokens:
+            chunks.append(source[chunk_start:block.start])
+            chunk_start = block.start
+            block_tokens = estimate(source[block.start:block.end])
+            chunk_tokens = 0
+        chunk_tokens += block_tokens
+        depth = max(0, depth + _liquid_depth_change(block.text(source)))
+        prev_end = block.end
+    chunks.append(source[chunk_start:])
+    return chunks
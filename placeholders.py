@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Placeholder Protection for Translation
+
+Masks spans that must never be translated (liquid tags and variables,
+inline code, Markdown link targets, URLs and HTML tags) with stable
+``__PRESERVE_<KIND>_<n>__`` tokens using one combined regex, and restores
+them with a single regex pass over the tokens. restore() should be the last
+step of a pipeline; anything run after it (typography included) sees the
+original spans and may rewrite them.
+
+Usage:
+    from placeholders import protect, restore
+
+    masked, originals = protect(text)
+    translated = translate(masked)
+    result = restore(translated, originals)
+"""
+
+import re
+from functools import lru_cache
+from typing import List, Sequence, Tuple
+
+# Order matters: earlier kinds win where patterns overlap at the same position
+PROTECTED_PATTERNS = (
+    ("LIQUID", r"{%[^%]*%}|{{[^}]*}}"),
+    ("CODE", r"`[^`]+`"),
+    ("LINK", r"(?<=\])\([^)\s]*(?:\s+\"[^\"]*\")?\)"),
+    ("URL", r"https?://[^\s)>\]]+|www\.[^\s)>\]]+"),
+    ("HTML", r"<!--[\s\S]*?-->|</?[A-Za-z][^<>\n]*>"),
+)
+
+DEFAULT_KINDS = tuple(kind for kind, _ in PROTECTED_PATTERNS)
+
+PLACEHOLDER_RE = re.compile(r"__PRESERVE_([A-Z]+)_(\d+)__")
+
+
+@lru_cache(maxsize=None)
+def _combined_pattern(kinds: Tuple[str, ...]) -> "re.Pattern":
+    selected = [f"(?P<{kind}>{pattern})" for kind, pattern in PROTECTED_PATTERNS if kind in kinds]
+    return re.compile("|".join(selected))
+
+
+def protect(text: str, kinds: Sequence[str] = DEFAULT_KINDS) -> Tuple[str, List[str]]:
+    """Replace protected spans with placeholders; returns (masked, originals)"""
+    originals: List[str] = []
+
+    def _mask(m: re.Match) -> str:
+        originals.append(m.group(0))
+        return f"__PRESERVE_{m.lastgroup}_{len(originals) - 1}__"
+
+    return _combined_pattern(tuple(kinds)).sub(_mask, text), originals
+
+
+def restore(text: str, originals: Sequence[str], drop: bool = False) -> str:
+    """Put the original spans back (or remove them with drop=True) in one pass"""
+    if not originals:
+        return text
+
+    def _unmask(m: re.Match) -> str:
+        index = int(m.group(2))
+        if index >= len(originals):
+            return m.group(0)
+        return "" if drop else originals[index]
+
+    return PLACEHOLDER_RE.sub(_unmask, text)
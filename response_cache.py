@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Persistent LLM Response Cache
+
+Content-addressed on-disk cache of chat-completion responses, shared by
+translate_docs.py and advanced_translator.py through the async backend.
+Entries are keyed by a SHA-256 of the model, temperature, system message
+and prompt, so reruns, --force passes and crash recovery never pay twice
+for an identical request. Each entry is a small JSON file under a two-level
+fan-out directory; a hit refreshes the file's mtime, and once the cache
+grows past its size budget the least recently used entries are deleted.
+
+Unlike the translation memory (one entry per source segment and engine
+version), this cache sits below the prompt builders: any change to the
+prompt text or model settings is a new key.
+
+Usage:
+    from response_cache import ResponseCache
+
+    cache = ResponseCache(docs_root / ".llm_response_cache", max_bytes=256 * 1024 * 1024)
+    key = cache.key(model, temperature, system_prompt, prompt)
+    response = cache.get(key)
+    if response is None:
+        response = call_api(...)
+        cache.put(key, response)
+"""
+
+import os
+import json
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIRNAME = ".llm_response_cache"
+DEFAULT_MAX_MB = 256
+
+# Eviction trims down to this fraction of max_bytes so it does not run on every put
+EVICT_TO = 0.9
+
+
+class ResponseCache:
+    """Size-bounded, content-addressed response store on disk"""
+
+    def __init__(self, directory, max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "misses": 0, "stored": 0, "evicted": 0}
+        self._lock = threading.Lock()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._size = sum(size for _, size, _ in self._entries())
+
+    @staticmethod
+    def key(model: str, temperature: float, system: str, prompt: str) -> str:
+        payload = json.dumps([model, float(temperature), system, prompt], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        """(mtime, size, path) for every cached entry"""
+        entries = []
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(".json"):
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+        return entries
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                response = json.load(f)["response"]
+            os.utime(path)  # Mark as recently used
+        except (OSError, ValueError, KeyError):
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        return response
+
+    def put(self, key: str, response: str) -> None:
+        path = self._path(key)
+        data = json.dumps({"response": response}, ensure_ascii=False).encode("utf-8")
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            path.parent.mkdir(exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Response cache write failed ({path}): {e}")
+            return
+        self.stats["stored"] += 1
+        with self._lock:
+            self._size += len(data)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until the cache is under EVICT_TO of its budget"""
+        entries = sorted(self._entries())
+        size = sum(entry_size for _, entry_size, _ in entries)
+        target = self.max_bytes * EVICT_TO
+        for _, entry_size, path in entries:
+            if size <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            size -= entry_size
+            self.stats["evicted"] += 1
+        self._size = size
+
+    def hit_rate(self) -> float:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return (self.stats["hits"] / lookups * 100) if lookups else 0.0
+
+
+def open_response_cache(docs_root: Path, max_mb: int = DEFAULT_MAX_MB) -> Optional[ResponseCache]:
+    """The response cache under docs_root, or None when disabled (max_mb <= 0) or unusable"""
+    if max_mb <= 0 or not Path(docs_root).is_dir():
+        return None
+    try:
+        return ResponseCache(Path(docs_root) / DEFAULT_DIRNAME, max_bytes=max_mb * 1024 * 1024)
+    except OSError as e:
+        logger.warning(f"Response cache disabled: {e}")
+        return None
+
+
+def cache_report(cache: Optional[ResponseCache]) -> Dict[str, int]:
+    """Response cache counters for run reports"""
+    if cache is None:
+        return {}
+    return {f"cache_{name}": value for name, value in cache.stats.items()}
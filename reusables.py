@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Reusables and Variables Index
+
+GitHub docs inline shared text with ``{% data reusables.x.y %}`` (Markdown
+files under data/reusables) and ``{% data variables.x.y %}`` (YAML files
+under data/variables). Pages keep these tags as protected placeholders, so
+their text has to be translated at the source: each reusable is translated
+once and the result cached by content hash, so a reusable used in 500 pages
+costs a single translation. With --emit the Arabic text is written next to
+the original as ``<name>-ar.md``.
+
+Variables are indexed for resolution only; they are mostly product names
+and UI labels that stay in English.
+
+Usage:
+    python3 reusables.py                  # Index and report references
+    python3 reusables.py --translate      # Translate new/changed reusables into the cache
+    python3 reusables.py --emit           # ...and write <name>-ar.md files alongside
+"""
+
+import os
+import re
+import sys
+import json
+import hashlib
+import logging
+import argparse
+from pathlib import Path
+from datetime import datetime
+from collections import Counter
+from typing import Dict, Iterable, Optional
+
+# Optional YAML support for data/variables
+try:
+    import yaml
+    HAS_YAML = True
+except ImportError:
+    HAS_YAML = False
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+ROOT = Path(__file__).resolve().parent
+CACHE_FILENAME = ".reusables_cache.json"
+
+DATA_REFERENCE = re.compile(r"{%-?\s*data\s+((?:reusables|variables)\.[\w.-]+)\s*-?%}")
+
+
+def _content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def find_references(text: str) -> Iterable[str]:
+    """Keys of every {% data ... %} reference in text"""
+    return DATA_REFERENCE.findall(text)
+
+
+class ReusableIndex:
+    """Index of data/reusables (Markdown) and data/variables (YAML) by data key"""
+
+    def __init__(self, docs_root: Path):
+        self.docs_root = Path(docs_root)
+        self.data_root = self.docs_root / "data"
+        self.reusables: Dict[str, Path] = {}
+        self.variables: Dict[str, str] = {}
+        self._scan_reusables()
+        self._scan_variables()
+
+    def _scan_reusables(self) -> None:
+        base = self.data_root / "reusables"
+        for root, _, files in os.walk(base):
+            for name in files:
+                if name.endswith(".md") and not name.endswith("-ar.md"):
+                    path = Path(root) / name
+                    rel = path.relative_to(base).with_suffix("")
+                    self.reusables["reusables." + ".".join(rel.parts)] = path
+
+    def _scan_variables(self) -> None:
+        base = self.data_root / "variables"
+        if not base.is_dir():
+            return
+        if not HAS_YAML:
+            logger.warning("PyYAML not installed; data/variables will not be indexed")
+            return
+        for path in sorted(base.rglob("*.yml")):
+            try:
+                data = yaml.safe_load(path.read_text(encoding="utf-8"))
+            except (OSError, yaml.YAMLError) as e:
+                logger.warning(f"Skipping {path}: {e}")
+                continue
+            prefix = "variables." + ".".join(path.relative_to(base).with_suffix("").parts)
+            self._flatten(prefix, data)
+
+    def _flatten(self, prefix: str, value) -> None:
+        if isinstance(value, dict):
+            for key, child in value.items():
+                self._flatten(f"{prefix}.{key}", child)
+        elif value is not None:
+            self.variables[prefix] = str(value)
+
+    def resolve(self, key: str) -> Optional[str]:
+        """English text of a reusable or variable, or None if unknown"""
+        if key in self.variables:
+            return self.variables[key]
+        path = self.reusables.get(key)
+        if path is None:
+            return None
+        try:
+            return path.read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+    def arabic_path(self, key: str) -> Path:
+        path = self.reusables[key]
+        return path.with_name(path.stem + "-ar.md")
+
+
+class ReusableTranslationCache:
+    """Arabic text per reusable, keyed by source content hash and translator version"""
+
+    def __init__(self, docs_root: Path):
+        self.path = Path(docs_root) / CACHE_FILENAME
+        self.entries: Dict[str, Dict[str, str]] = {}
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f).get("reusables", {})
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable reusables cache ({self.path}): {e}")
+
+    def get(self, key: str, source_hash: str, version: str) -> Optional[str]:
+        entry = self.entries.get(key)
+        if entry and entry.get("source_hash") == source_hash and entry.get("version") == version:
+            return entry["arabic"]
+        return None
+
+    def put(self, key: str, source_hash: str, version: str, arabic: str) -> None:
+        self.entries[key] = {"source_hash": source_hash, "version": version, "arabic": arabic}
+
+    def save(self) -> None:
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"updated": datetime.now().isoformat(), "reusables": self.entries}, f,
+                      ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+def translate_reusables(translator, index: ReusableIndex, keys: Optional[Iterable[str]] = None,
+                        emit: bool = False) -> Dict[str, int]:
+    """Translate reusables (all, or just keys) once each, reusing cached results
+
+    translator is a LocalAITranslator. With emit=True each translation is also
+    written to <name>-ar.md next to its source. Returns translated/cached/emitted counts.
+    """
+    cache = ReusableTranslationCache(index.docs_root)
+    version = translator.enhance_version
+    counts = {"translated": 0, "cached": 0, "emitted": 0}
+
+    for key in sorted(set(keys) if keys is not None else index.reusables):
+        if key not in index.reusables:
+            continue
+        source = index.resolve(key)
+        if source is None:
+            continue
+        source_hash = _content_hash(source)
+        arabic = cache.get(key, source_hash, version)
+        if arabic is None:
+            arabic = translator.translate_markdown(source)
+            cache.put(key, source_hash, version, arabic)
+            counts["translated"] += 1
+        else:
+            counts["cached"] += 1
+
+        if emit:
+            out_path = index.arabic_path(key)
+            try:
+                current = out_path.read_text(encoding="utf-8")
+            except OSError:
+                current = None
+            if current != arabic:
+                out_path.write_text(arabic, encoding="utf-8")
+                counts["emitted"] += 1
+
+    cache.save()
+    return counts
+
+
+def count_references(content_root: Path) -> Counter:
+    """How many English pages reference each data key"""
+    references: Counter = Counter()
+    for path in content_root.rglob("*.md"):
+        if path.name.endswith("-ar.md"):
+            continue
+        try:
+            text = path.read_text(encoding="utf-8", errors="ignore")
+        except OSError:
+            continue
+        references.update(set(find_references(text)))
+    return references
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index and translate docs reusables")
+    parser.add_argument("--root", type=str, help="Path to docs root (directory that contains 'content' and 'data')")
+    parser.add_argument("--translate", action="store_true", help="Translate new or changed reusables into the cache")
+    parser.add_argument("--emit", action="store_true", help="Translate and write <name>-ar.md next to each reusable")
+    parser.add_argument("--top", type=int, default=20, help="Number of most-referenced reusables to list")
+
+    args = parser.parse_args()
+
+    docs_root = Path(args.root).resolve() if args.root else ROOT / "docs"
+    index = ReusableIndex(docs_root)
+    if not index.reusables:
+        logger.error(f"No reusables found under {index.data_root / 'reusables'}")
+        sys.exit(1)
+
+    references = count_references(docs_root / "content")
+    print("\n♻️  REUSABLES INDEX")
+    print("=" * 45)
+    print(f"Reusables: {len(index.reusables)}")
+    print(f"Variables: {len(index.variables)}")
+    print(f"Pages referencing data keys: {sum(references.values())} references to {len(references)} keys")
+    missing = [key for key in references if key.startswith("reusables.") and key not in index.reusables]
+    if missing:
+        print(f"Unresolved reusable references: {len(missing)}")
+    print("\nMost referenced reusables:")
+    for key, count in [(k, c) for k, c in references.most_common() if k in index.reusables][:args.top]:
+        print(f"  {count:5d} pages  {key}")
+
+    if args.translate or args.emit:
+        from local_ai_translator import LocalAITranslator
+
+        translator = LocalAITranslator(docs_root=str(docs_root))
+        counts = translate_reusables(translator, index, emit=args.emit)
+        print(f"\n✅ Reusables translated: {counts['translated']}, reused from cache: {counts['cached']}"
+              + (f", files written: {counts['emitted']}" if args.emit else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Script Histogram
+
+Counts Arabic letters, Latin letters, digits and punctuation in a text in a
+single pass, and derives the Arabic ratio and English-leak heuristics used by
+the translator, the coverage audit and the web app from those counts.
+
+Short texts are classified with one str.translate into marker characters;
+large texts and batches use a NumPy code-point array when NumPy is
+installed. "Arabic" is the whole U+0600–U+06FF block, matching the
+character class the previous per-caller regexes used.
+
+Usage:
+    from script_histogram import arabic_ratio, likely_english, likely_english_batch
+
+    if likely_english(arabic_page):
+        ...
+    flags = likely_english_batch(pages)
+"""
+
+import re
+import string
+from typing import List, NamedTuple, Pattern, Sequence
+
+# Optional vectorized backend
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# Inputs at least this long use the NumPy path when available
+NUMPY_MIN_CHARS = 100_000
+
+ENGLISH_CUES = [
+    r"\bPrerequisites\b", r"\bOverview\b", r"\bSummary\b", r"\bSteps\b",
+    r"\bNote:\b", r"\bTip:\b", r"\bCaution:\b", r"\bWarning:\b",
+    r"\bAbout GitHub\b", r"\bGitHub Actions\b", r"\bThis guide\b",
+    r"\bYou can\b", r"\bTo [a-z]+:\b", r"\bExample\b", r"\bLearn more\b",
+]
+EN_PATTERN = re.compile("|".join(ENGLISH_CUES))
+
+# Fenced code, inline code, liquid tags/variables and URLs carry no prose
+NON_PROSE = re.compile(r"```[\s\S]*?```|`[^`]+`|{%[^%]*%}|{{[^}]*}}|https?://[^\s)]+")
+
+ARABIC_RANGE = (0x0600, 0x06FF)
+
+# str.translate table mapping each class onto a marker. Markers are Latin
+# letters, which are themselves remapped, so each marker counts one class only.
+_MARKERS = {"arabic": "a", "latin": "l", "digits": "d", "punct": "p"}
+_CLASS_TABLE = {}
+for _cp in range(ARABIC_RANGE[0], ARABIC_RANGE[1] + 1):
+    _CLASS_TABLE[_cp] = _MARKERS["arabic"]
+for _ch in string.ascii_letters:
+    _CLASS_TABLE[ord(_ch)] = _MARKERS["latin"]
+for _ch in string.digits:
+    _CLASS_TABLE[ord(_ch)] = _MARKERS["digits"]
+for _ch in string.punctuation:
+    _CLASS_TABLE[ord(_ch)] = _MARKERS["punct"]
+
+if HAS_NUMPY:
+    # Class code per code point below U+0700; everything above is "other" (0)
+    _CLASS_LUT = np.zeros(ARABIC_RANGE[1] + 2, dtype=np.uint8)
+    for _cp, _marker in _CLASS_TABLE.items():
+        _CLASS_LUT[_cp] = "aldp".index(_marker) + 1
+
+
+class ScriptHistogram(NamedTuple):
+    """Character counts per script class for one text"""
+
+    arabic: int
+    latin: int
+    digits: int
+    punct: int
+    total: int
+
+    @property
+    def letters(self) -> int:
+        return self.arabic + self.latin
+
+    @property
+    def arabic_ratio(self) -> float:
+        """Share of Arabic among Arabic + Latin characters (1.0 when there are none)"""
+        letters = self.arabic + self.latin
+        return self.arabic / letters if letters else 1.0
+
+
+def _histogram_translate(text: str) -> ScriptHistogram:
+    marked = text.translate(_CLASS_TABLE)
+    return ScriptHistogram(marked.count("a"), marked.count("l"), marked.count("d"), marked.count("p"), len(text))
+
+
+def _class_codes(text: str) -> "np.ndarray":
+    codepoints = np.frombuffer(text.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+    return _CLASS_LUT[np.minimum(codepoints, len(_CLASS_LUT) - 1)]
+
+
+def _histogram_numpy(text: str) -> ScriptHistogram:
+    counts = np.bincount(_class_codes(text), minlength=5)
+    return ScriptHistogram(int(counts[1]), int(counts[2]), int(counts[3]), int(counts[4]), len(text))
+
+
+def script_histogram(text: str) -> ScriptHistogram:
+    """Count each script class in text in a single pass"""
+    if HAS_NUMPY and len(text) >= NUMPY_MIN_CHARS:
+        return _histogram_numpy(text)
+    return _histogram_translate(text)
+
+
+def script_histograms(texts: Sequence[str]) -> List[ScriptHistogram]:
+    """Histograms for many texts; with NumPy all texts are classified in one array pass"""
+    if not HAS_NUMPY or not texts:
+        return [_histogram_translate(text) for text in texts]
+
+    lengths = np.fromiter((len(text) for text in texts), dtype=np.int64, count=len(texts))
+    codes = _class_codes("".join(texts)).astype(np.int64)
+    # One bincount over (text index, class) pairs yields every histogram at once
+    owners = np.repeat(np.arange(len(texts), dtype=np.int64), lengths)
+    counts = np.bincount(owners * 5 + codes, minlength=len(texts) * 5).reshape(len(texts), 5)
+    return [
+        ScriptHistogram(int(row[1]), int(row[2]), int(row[3]), int(row[4]), int(length))
+        for row, length in zip(counts, lengths)
+    ]
+
+
+def strip_non_prose(text: str) -> str:
+    """Remove code, liquid and URLs so only prose is scored"""
+    return NON_PROSE.sub("", text)
+
+
+def arabic_ratio(text: str) -> float:
+    return script_histogram(text).arabic_ratio
+
+
+def _is_english(cleaned: str, histogram: ScriptHistogram, cues: Pattern) -> bool:
+    ratio = histogram.arabic_ratio
+    # Gate obvious English sections with cues but avoid counting mostly Arabic text
+    if ratio < 0.5 and cues.search(cleaned):
+        return True
+    # Stricter heuristic
+    return histogram.latin > 150 and ratio < 0.15
+
+
+def likely_english(text: str, cues: Pattern = EN_PATTERN) -> bool:
+    """True if a supposedly Arabic text still reads as English"""
+    cleaned = strip_non_prose(text)
+    return _is_english(cleaned, script_histogram(cleaned), cues)
+
+
+def likely_english_batch(texts: Sequence[str], cues: Pattern = EN_PATTERN) -> List[bool]:
+    """likely_english over many texts, scoring all of them with one histogram pass"""
+    cleaned = [strip_non_prose(text) for text in texts]
+    return [_is_english(c, h, cues) for c, h in zip(cleaned, script_histograms(cleaned))]
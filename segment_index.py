@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Corpus Segment Frequency Index
+
+Counts how often each translatable segment (heading, paragraph, list item,
+quote line, table cell: the spans the local engine translates) occurs
+across all English pages under docs/content. Segments are keyed after
+normalizing whitespace and liquid tag spacing. The report shows the hottest
+segments and the share of corpus bytes they cover; --pretranslate N
+translates the top N once into the translation memory so bulk runs start
+warm.
+
+Usage:
+    python3 segment_index.py                      # Top 50 segments and coverage
+    python3 segment_index.py --top 200            # Longer report
+    python3 segment_index.py --pretranslate 2000  # Warm the translation memory
+"""
+
+import os
+import re
+import sys
+import json
+import logging
+import argparse
+from pathlib import Path
+from collections import Counter
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from markdown_blocks import tokenize_blocks
+from translation_memory import normalize_segment
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+ROOT = Path(__file__).resolve().parent
+SKIP_DIRS = {"assets", "images", "_snippets"}
+
+FRONTMATTER = re.compile(r"\A\s*---\n.*?\n---[ \t]*\n?", re.DOTALL)
+LIQUID_SPACING = re.compile(r"({[{%])-?\s*(.*?)\s*-?([%}]})", re.DOTALL)
+
+
+def normalize_key(segment: str) -> str:
+    """Index key: collapsed whitespace and canonical liquid tag spacing"""
+    return LIQUID_SPACING.sub(r"\1 \2 \3", normalize_segment(segment))
+
+
+def english_pages(content_root: Path) -> Iterator[Path]:
+    for root, dirs, files in os.walk(content_root):
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+        for name in files:
+            if name.endswith(".md") and not name.endswith("-ar.md"):
+                yield Path(root) / name
+
+
+class SegmentIndex:
+    """Segment frequencies over a set of English pages"""
+
+    def __init__(self):
+        self.counts: Counter = Counter()
+        self.samples: Dict[str, str] = {}  # key -> first original spelling
+        self.files = 0
+        self.corpus_bytes = 0
+
+    def add_page(self, text: str) -> None:
+        self.files += 1
+        self.corpus_bytes += len(text.encode("utf-8"))
+        body = FRONTMATTER.sub("", text, count=1)
+        for block in tokenize_blocks(body):
+            for segment in block.segments(body):
+                key = normalize_key(segment)
+                if not key:
+                    continue
+                self.counts[key] += 1
+                if key not in self.samples:
+                    self.samples[key] = segment
+
+    def top(self, n: int) -> List[Tuple[str, int]]:
+        """The n repeated segments with the most reusable bytes ((count - 1) x size)
+
+        Segments seen once are left out: translating them ahead of time
+        never saves work.
+        """
+        repeated = [item for item in self.counts.items() if item[1] > 1]
+        return sorted(repeated, key=lambda item: (item[1] - 1) * len(item[0].encode("utf-8")),
+                      reverse=True)[:n]
+
+    def segment_bytes(self, entries: Optional[List[Tuple[str, int]]] = None) -> int:
+        if entries is None:
+            entries = self.counts.items()
+        return sum(count * len(key.encode("utf-8")) for key, count in entries)
+
+    def coverage(self, n: int) -> float:
+        """Fraction of corpus bytes covered by the top n segments"""
+        if not self.corpus_bytes:
+            return 0.0
+        return self.segment_bytes(self.top(n)) / self.corpus_bytes
+
+
+def build_segment_index(content_root: Path) -> SegmentIndex:
+    index = SegmentIndex()
+    for path in english_pages(content_root):
+        try:
+            index.add_page(path.read_text(encoding="utf-8", errors="ignore"))
+        except OSError as e:
+            logger.warning(f"Skipping {path}: {e}")
+    logger.info(f"Indexed {len(index.counts)} distinct segments from {index.files} pages")
+    return index
+
+
+def pretranslate(translator, index: SegmentIndex, n: int) -> int:
+    """Translate the top n segments once so they land in the translation memory
+
+    translator is a LocalAITranslator; returns the number of segments translated.
+    """
+    segments = [index.samples[key] for key, _ in index.top(n)]
+    translator.translate_batch(segments)
+    if translator.translation_memory is not None:
+        translator.translation_memory.flush()
+    return len(segments)
+
+
+def print_report(index: SegmentIndex, top_n: int) -> None:
+    entries = index.top(top_n)
+    segment_bytes = index.segment_bytes()
+    repeated = sum(1 for count in index.counts.values() if count > 1)
+
+    print("\n📚 SEGMENT FREQUENCY INDEX")
+    print("=" * 45)
+    print(f"English pages: {index.files}")
+    print(f"Corpus size: {index.corpus_bytes / 1024 / 1024:.1f} MB")
+    print(f"Distinct segments: {len(index.counts)} ({repeated} occur more than once)")
+    if index.corpus_bytes:
+        print(f"Translatable text: {segment_bytes / index.corpus_bytes * 100:.1f}% of corpus bytes")
+    for n in (10, 100, 1000, 10000):
+        if n <= len(index.counts):
+            print(f"Top {n} segments cover: {index.coverage(n) * 100:.1f}% of corpus bytes")
+
+    print(f"\nTop {len(entries)} segments by repeated bytes:")
+    for key, count in entries:
+        preview = key if len(key) <= 80 else key[:77] + "..."
+        print(f"  {count:6d}x  {preview}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Corpus segment frequency index")
+    parser.add_argument("--root", type=str, help="Path to docs root (directory that contains 'content')")
+    parser.add_argument("--top", type=int, default=50, help="Number of segments to list")
+    parser.add_argument("--pretranslate", type=int, default=0,
+                        help="Translate the top N segments into the translation memory")
+    parser.add_argument("--aggressive", action="store_true", help="Pretranslate with aggressive lexical fallback")
+    parser.add_argument("--arabic-only", action="store_true", help="Pretranslate for Arabic-only output")
+    parser.add_argument("--json", type=str, help="Also write the top segments to this JSON file")
+
+    args = parser.parse_args()
+
+    docs_root = Path(args.root).resolve() if args.root else ROOT / "docs"
+    content_root = docs_root / "content"
+    if not content_root.is_dir():
+        logger.error(f"Content directory not found: {content_root}")
+        sys.exit(1)
+
+    index = build_segment_index(content_root)
+    print_report(index, args.top)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({
+                "files": index.files,
+                "corpus_bytes": index.corpus_bytes,
+                "segments": [{"text": key, "count": count} for key, count in index.top(args.top)],
+            }, f, ensure_ascii=False, indent=2)
+
+    if args.pretranslate:
+        from local_ai_translator import LocalAITranslator
+
+        translator = LocalAITranslator(docs_root=str(docs_root), aggressive=args.aggressive,
+                                       arabic_only=args.arabic_only)
+        if translator.translation_memory is None:
+            logger.error("Translation memory unavailable; nothing to pretranslate into")
+            sys.exit(1)
+        count = pretranslate(translator, index, args.pretranslate)
+        print(f"\n✅ Pretranslated {count} segments into {translator.translation_memory.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""AsyncTranslationBackend driven through client= injection with a fake OpenAI client"""
+
+import io
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from llm_backend import (AsyncTranslationBackend, OrderedChunkWriter, TranslationError, resolve_api_key,
+                         translate_chunked)
+
+BODY = "\n\n".join(f"Paragraph {i}: " + "Create a repository and open a pull request. " * 40 for i in range(6))
+
+
+def fake_translation(prompt: str) -> str:
+    # Surrounding whitespace checks that streamed and plain responses are stripped alike
+    return f"\n  ترجمة:\n{prompt[::-1]}  \n\n"
+
+
+class FakeCompletions:
+    """chat.completions stand-in: plain or streamed replies, optional failing prompts"""
+
+    def __init__(self, fail_on: str = "", delay: float = 0.0):
+        self.fail_on = fail_on
+        self.delay = delay
+        self.calls = 0
+
+    async def create(self, model, messages, temperature, max_tokens, stream=False, stream_options=None):
+        self.calls += 1
+        prompt = messages[-1]["content"]
+        if self.fail_on and self.fail_on in prompt:
+            raise RuntimeError("bad chunk")
+        await asyncio.sleep(self.delay)
+        text = fake_translation(prompt)
+        usage = SimpleNamespace(prompt_tokens=len(prompt) // 4, completion_tokens=len(text) // 4,
+                                total_tokens=(len(prompt) + len(text)) // 4)
+        if not stream:
+            message = SimpleNamespace(content=text)
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+        return self._events(text, usage)
+
+    async def _events(self, text, usage):
+        for start in range(0, len(text), 7):
+            delta = SimpleNamespace(content=text[start:start + 7])
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)], usage=None)
+            await asyncio.sleep(0)
+        yield SimpleNamespace(choices=[], usage=usage)
+
+
+def make_backend(completions: FakeCompletions, concurrency: int = 4) -> AsyncTranslationBackend:
+    client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return AsyncTranslationBackend(model="gpt-4", temperature=0.2, system_prompt="system",
+                                   concurrency=concurrency, max_concurrency=concurrency, client=client)
+
+
+def test_streamed_and_plain_responses_match():
+    async def run():
+        backend = make_backend(FakeCompletions())
+        plain = await backend.complete("Hello, world")
+        deltas = []
+        streamed = await backend.complete("Hello, world", on_delta=deltas.append)
+        return plain, streamed, "".join(deltas)
+
+    plain, streamed, joined = asyncio.run(run())
+    assert plain == fake_translation("Hello, world").strip()
+    assert streamed == plain
+    assert joined == plain
+
+
+def test_streamed_chunks_write_the_same_page():
+    async def run():
+        backend = make_backend(FakeCompletions())
+        plain = await translate_chunked(BODY, lambda chunk, part: backend.complete(chunk), max_tokens=300)
+        out = io.StringIO()
+        writer = OrderedChunkWriter(out)
+        streamed = await translate_chunked(BODY, lambda chunk, part, on_delta: backend.complete(chunk, on_delta),
+                                           max_tokens=300, sink=writer)
+        return plain, streamed, out.getvalue(), writer.bytes_written
+
+    plain, streamed, written, bytes_written = asyncio.run(run())
+    assert streamed == plain
+    assert written == plain
+    assert bytes_written == len(plain.encode("utf-8"))
+
+
+def test_failed_chunk_releases_every_limiter_slot():
+    async def run():
+        completions = FakeCompletions(fail_on="Paragraph 0", delay=0.2)
+        backend = make_backend(completions)
+        for _ in range(3):
+            with pytest.raises(TranslationError):
+                await translate_chunked(BODY, lambda chunk, part: backend.complete(chunk), max_tokens=300, retries=0)
+            await asyncio.sleep(0)
+            assert backend.limiter.in_flight == 0
+        calls = completions.calls
+        await asyncio.sleep(0.3)
+        # Cancelled siblings send nothing more, and a halved limit still admits requests
+        assert completions.calls == calls
+        backend.limiter.release(await backend.limiter.acquire(), throttled=True, retry_after=0)
+        return await asyncio.wait_for(backend.complete("still works"), timeout=5)
+
+    assert asyncio.run(run()) == fake_translation("still works").strip()
+
+
+def test_base_url_without_api_key_gets_a_placeholder(monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.delenv("OPENAI_BASE_URL", raising=False)
+    assert resolve_api_key() is None
+    assert resolve_api_key("http://127.0.0.1:8000/v1")
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-real")
+    assert resolve_api_key("http://127.0.0.1:8000/v1") == "sk-real"
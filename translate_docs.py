@@ -14,11 +14,15 @@ Features:
 - Maintains proper markdown formatting
 - Generates comprehensive translation reports
 - Handles special content like code examples and liquid syntax
+- Checkpoints progress so an interrupted run resumes where it stopped
+- Optional streaming: pages are written as the translation arrives
 
 Usage:
     python translate_docs.py
-    python translate_docs.py --dry-run  # Preview only, no files created
-    python translate_docs.py --force    # Overwrite existing translations
+    python translate_docs.py --dry-run    # Preview only, no files created
+    python translate_docs.py --force      # Overwrite existing translations
+    python translate_docs.py --no-resume  # Ignore the checkpoint of an earlier run
+    python translate_docs.py --stream     # Stream responses straight into the output files
 """
 
 import os
@@ -27,9 +31,16 @@ import json
 import argparse
 import logging
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, List, Tuple, Optional
 from datetime import datetime
-import time
+import asyncio
+import hashlib
+
+from llm_backend import (AsyncTranslationBackend, OrderedChunkWriter, SegmentPacker, TranslationError, run_queue,
+                         translate_chunked, DEFAULT_CONCURRENCY, DEFAULT_MAX_CONCURRENCY, DEFAULT_RPM, DEFAULT_TPM,
+                         DEFAULT_CHUNK_TOKENS, resolve_api_key)
+from response_cache import open_response_cache, cache_report, DEFAULT_MAX_MB as DEFAULT_CACHE_MB
+from translation_memory import open_translation_memory, DEFAULT_FILENAME as TM_FILENAME
 
 # Import for AI translation (install with: pip install openai)
 try:
@@ -58,10 +69,82 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def log_progress(rel_path: str, bytes_written: int) -> None:
+    """Default streaming progress callback"""
+    logger.debug(f"{rel_path}: {bytes_written:,} bytes written")
+
+
+class TranslationCheckpoint:
+    """Progress of a run: files translated and files that failed
+    
+    Written atomically every few files and when the run stops, so a rerun
+    skips what is done and retries only what failed or never started. A
+    checkpoint made with different settings is ignored.
+    """
+    
+    FILENAME = ".translate_checkpoint.json"
+    SAVE_EVERY = 25
+    
+    def __init__(self, docs_root: Path, settings: Dict, resume: bool = True):
+        self.path = docs_root / self.FILENAME
+        self.settings = settings
+        self.done: set = set()
+        self.failed: Dict[str, str] = {}
+        self._unsaved = 0
+        if resume and self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get("settings") == settings:
+                    self.done = set(data.get("done", []))
+                    self.failed = data.get("failed", {})
+                else:
+                    logger.info("Checkpoint was made with different settings; starting over")
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable checkpoint {self.path}: {e}")
+    
+    def is_done(self, rel_path: str) -> bool:
+        return rel_path in self.done
+    
+    def mark_done(self, rel_path: str) -> None:
+        self.done.add(rel_path)
+        self.failed.pop(rel_path, None)
+        self._changed()
+    
+    def mark_failed(self, rel_path: str, error: str) -> None:
+        self.failed[rel_path] = error
+        self._changed()
+    
+    def _changed(self) -> None:
+        self._unsaved += 1
+        if self._unsaved >= self.SAVE_EVERY:
+            self.save()
+    
+    def save(self) -> None:
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"updated": datetime.now().isoformat(), "settings": self.settings,
+                       "done": sorted(self.done), "failed": self.failed}, f, indent=1, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self._unsaved = 0
+    
+    def clear(self) -> None:
+        """Remove the checkpoint once a run has finished cleanly"""
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+
 class GitHubDocsTranslator:
     """Main translator class for GitHub documentation"""
     
-    def __init__(self, docs_root: str = "docs", target_lang: str = "ar", dry_run: bool = False, force: bool = False):
+    def __init__(self, docs_root: str = "docs", target_lang: str = "ar", dry_run: bool = False, force: bool = False,
+                 concurrency: int = DEFAULT_CONCURRENCY, rpm: int = DEFAULT_RPM, tpm: int = DEFAULT_TPM,
+                 base_url: Optional[str] = None, max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 chunk_tokens: int = DEFAULT_CHUNK_TOKENS, pack: bool = False,
+                 response_cache_mb: int = DEFAULT_CACHE_MB, resume: bool = True, stream: bool = False,
+                 progress: Optional[Callable[[str, int], None]] = None):
         self.docs_root = Path(docs_root)
         self.content_root = self.docs_root / "content"
         self.target_lang = target_lang
@@ -78,6 +161,7 @@ class GitHubDocsTranslator:
             "missing_translations": 0,
             "created_translations": 0,
             "skipped_files": 0,
+            "resumed_files": 0,
             "errors": 0
         }
         
@@ -92,14 +176,35 @@ class GitHubDocsTranslator:
             r"__pycache__"
         ]
         
-        # Initialize OpenAI client if available
-        self.openai_client = None
-        if HAS_OPENAI:
-            api_key = os.getenv('OPENAI_API_KEY')
-            if api_key:
-                self.openai_client = openai.OpenAI(api_key=api_key)
-            else:
-                logger.warning("OPENAI_API_KEY not found in environment variables")
+        # OpenAI access; the async backend is created for the duration of a run
+        self.api_key = resolve_api_key(base_url) if HAS_OPENAI else None
+        if HAS_OPENAI and not self.api_key:
+            logger.warning("OPENAI_API_KEY not found in environment variables")
+        self.concurrency = max(1, concurrency)
+        self.max_concurrency = max(self.concurrency, max_concurrency)
+        self.rpm = rpm
+        self.tpm = tpm
+        self.base_url = base_url
+        self.chunk_tokens = max(1, chunk_tokens)
+        self.pack = pack
+        self.response_cache_mb = response_cache_mb
+        self.resume = resume
+        # Streaming writes each page as it arrives; progress(rel_path, bytes) reports it
+        self.stream = stream
+        self.progress = progress
+        self.checkpoint: Optional[TranslationCheckpoint] = None
+        self.backend: Optional[AsyncTranslationBackend] = None
+        self.packer: Optional[SegmentPacker] = None
+        self.llm_stats: Dict[str, int] = {}
+        
+        # Model settings and the persistent translation memory keyed by them
+        self.model = "gpt-4"
+        self.temperature = 0.3
+        self.system_prompt = "You are an expert Arabic translator specializing in technical documentation. Translate GitHub documentation from English to Arabic while preserving markdown formatting, code blocks, liquid tags, and technical terms. Maintain the original structure and meaning."
+        prompt_template = self._create_translation_prompt("{text}", "{context}")
+        self.tm_version = f"{self.model}:{self.temperature}:" + hashlib.sha1(
+            (self.system_prompt + prompt_template).encode("utf-8")).hexdigest()[:12]
+        self.translation_memory = open_translation_memory(self.docs_root / TM_FILENAME)
     
     def should_skip_file(self, file_path: str) -> bool:
         """Check if file should be skipped based on patterns"""
@@ -188,42 +293,65 @@ class GitHubDocsTranslator:
                 "full_content": content
             }
     
-    def translate_text(self, text: str, context: str = "") -> str:
-        """Translate English text to Arabic using OpenAI"""
-        if not self.openai_client:
-            logger.warning("OpenAI client not available, returning placeholder translation")
+    async def _request_translation(self, text: str, context: str,
+                                   on_delta: Optional[Callable[[str], None]] = None) -> str:
+        """Translation memory lookup, then one API request; errors propagate
+        
+        on_delta, if given, receives the translation as it is produced
+        (streamed from the API, or in one piece when it comes from memory).
+        """
+        tm = self.translation_memory
+        if tm is not None:
+            remembered = tm.lookup("openai:translate_docs", self.tm_version, text)
+            if remembered is not None:
+                if on_delta is not None:
+                    on_delta(remembered)
+                return remembered
+        
+        if self.packer is not None and self.packer.accepts(text):
+            translation = await self.packer.translate(text, context)
+            if on_delta is not None:
+                on_delta(translation)
+        else:
+            translation = await self.backend.complete(self._create_translation_prompt(text, context),
+                                                      on_delta=on_delta)
+        
+        # Post-process translation to ensure liquid tags are preserved
+        translation = self._preserve_liquid_tags(text, translation)
+        
+        # Commit immediately: each API result is worth keeping across crashes
+        if tm is not None:
+            tm.store("openai:translate_docs", self.tm_version, text, translation, durable=True)
+        
+        return translation
+    
+    async def translate_text(self, text: str, context: str = "") -> str:
+        """Translate English text to Arabic using OpenAI; raises TranslationError on failure"""
+        if self.backend is None:
+            if not self.dry_run:
+                raise TranslationError("OpenAI client not available")
             return f"[TRANSLATION NEEDED: {text[:50]}...]"
         
-        try:
-            # Create translation prompt
-            prompt = self._create_translation_prompt(text, context)
-            
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert Arabic translator specializing in technical documentation. Translate GitHub documentation from English to Arabic while preserving markdown formatting, code blocks, liquid tags, and technical terms. Maintain the original structure and meaning."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.3,
-                max_tokens=4000
-            )
-            
-            translation = response.choices[0].message.content.strip()
-            
-            # Post-process translation to ensure liquid tags are preserved
-            translation = self._preserve_liquid_tags(text, translation)
-            
+        return await self._request_translation(text, context)
+    
+    async def translate_body(self, text: str, context: str = "", sink: Optional[OrderedChunkWriter] = None) -> str:
+        """Translate a page body in token-budgeted chunks, retrying each chunk on its own
+        
+        Raises TranslationError if any chunk still fails; the others stay in
+        the translation memory and response cache for the next attempt. With
+        a sink, the translation is also written to it as it streams in.
+        """
+        if self.backend is None:
+            translation = await self.translate_text(text, context)
+            if sink is not None:
+                sink.write(0, translation)
+                sink.finish(0)
             return translation
-            
-        except Exception as e:
-            logger.error(f"Translation error: {e}")
-            return f"[TRANSLATION ERROR: {text[:50]}...]"
+        
+        async def translate_chunk(chunk: str, part: str, on_delta: Optional[Callable[[str], None]] = None) -> str:
+            return await self._request_translation(chunk, f"{context}, {part}" if part else context, on_delta)
+        
+        return await translate_chunked(text, translate_chunk, max_tokens=self.chunk_tokens, sink=sink)
     
     def _create_translation_prompt(self, text: str, context: str) -> str:
         """Create a detailed translation prompt"""
@@ -281,64 +409,107 @@ Arabic translation:"""
         
         return translation
     
-    def translate_frontmatter(self, frontmatter: Dict) -> Dict:
+    async def translate_frontmatter(self, frontmatter: Dict) -> Dict:
         """Translate relevant frontmatter fields"""
         translated_fm = frontmatter.copy()
         
         # Fields that should be translated
         translatable_fields = ['title', 'shortTitle', 'intro', 'permissions']
+        fields = [field for field in translatable_fields
+                  if translated_fm.get(field) and isinstance(translated_fm[field], str)]
         
-        for field in translatable_fields:
-            if field in translated_fm and translated_fm[field]:
-                original_value = translated_fm[field]
-                if isinstance(original_value, str):
-                    translated_fm[field] = self.translate_text(
-                        original_value, 
-                        context=f"frontmatter field: {field}"
-                    )
+        # Fields are independent requests, so send them together
+        translations = await asyncio.gather(*(
+            self.translate_text(translated_fm[field], context=f"frontmatter field: {field}")
+            for field in fields
+        ))
+        translated_fm.update(zip(fields, translations))
         
         return translated_fm
     
-    def create_arabic_content(self, english_content: str, file_path: str) -> str:
+    async def create_arabic_content(self, english_content: str, file_path: str) -> str:
         """Create complete Arabic content from English content"""
         parsed = self.extract_translatable_content(english_content)
         
-        # Translate frontmatter
-        if parsed["frontmatter"]:
-            translated_frontmatter = self.translate_frontmatter(parsed["frontmatter"])
-        else:
-            translated_frontmatter = {}
+        async def frontmatter_task():
+            if parsed["frontmatter"]:
+                return await self.translate_frontmatter(parsed["frontmatter"])
+            return {}
         
-        # Translate main content
-        if parsed["content"].strip():
-            translated_content = self.translate_text(
-                parsed["content"], 
-                context=f"documentation file: {file_path}"
-            )
-        else:
-            translated_content = parsed["content"]
+        async def content_task():
+            if parsed["content"].strip():
+                return await self.translate_body(
+                    parsed["content"], 
+                    context=f"documentation file: {file_path}"
+                )
+            return parsed["content"]
+        
+        # Translate frontmatter and main content concurrently
+        translated_frontmatter, translated_content = await asyncio.gather(frontmatter_task(), content_task())
         
         # Reconstruct the file
-        if translated_frontmatter:
-            # Convert frontmatter back to YAML
-            fm_lines = ["---"]
-            for key, value in translated_frontmatter.items():
-                if isinstance(value, str):
-                    # Escape quotes if necessary
-                    if '"' in value or "'" in value:
-                        value = repr(value)
-                    fm_lines.append(f"{key}: {value}")
-                else:
-                    fm_lines.append(f"{key}: {value}")
-            fm_lines.append("---")
-            
-            result = "\n".join(fm_lines) + "\n\n" + translated_content
-        else:
-            result = translated_content
+        return self._render_frontmatter(translated_frontmatter) + translated_content
+    
+    def _render_frontmatter(self, translated_frontmatter: Dict) -> str:
+        """Frontmatter block (with the blank line after it) for the Arabic file"""
+        if not translated_frontmatter:
+            return ""
+        
+        # Convert frontmatter back to YAML
+        fm_lines = ["---"]
+        for key, value in translated_frontmatter.items():
+            if isinstance(value, str):
+                # Escape quotes if necessary
+                if '"' in value or "'" in value:
+                    value = repr(value)
+                fm_lines.append(f"{key}: {value}")
+            else:
+                fm_lines.append(f"{key}: {value}")
+        fm_lines.append("---")
         
-        return result
+        return "\n".join(fm_lines) + "\n\n"
     
-    def process_file(self, english_file: Path) -> bool:
+    async def write_arabic_streamed(self, english_content: str, rel_path: str, arabic_file: Path) -> int:
+        """Translate and write a page as the body streams in; returns bytes written
+        
+        Output goes to a .part file next to the target and is renamed over it
+        only once complete, so a failed or interrupted page never leaves a
+        partial translation behind.
+        """
+        parsed = self.extract_translatable_content(english_content)
+        translated_frontmatter = {}
+        if parsed["frontmatter"]:
+            translated_frontmatter = await self.translate_frontmatter(parsed["frontmatter"])
+        header = self._render_frontmatter(translated_frontmatter)
+        
+        arabic_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = arabic_file.with_name(arabic_file.name + ".part")
+        header_bytes = len(header.encode("utf-8"))
+        progress = None
+        if self.progress is not None:
+            progress = lambda written: self.progress(rel_path, header_bytes + written)
+        try:
+            with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+                f.write(header)
+                writer = OrderedChunkWriter(f, progress)
+                try:
+                    # translate_body cancels its chunk tasks before raising
+                    if parsed["content"].strip():
+                        await self.translate_body(parsed["content"], context=f"documentation file: {rel_path}",
+                                                  sink=writer)
+                    else:
+                        writer.write(0, parsed["content"])
+                        writer.finish(0)
+                    written = header_bytes + writer.bytes_written
+                finally:
+                    writer.close()
+            os.replace(tmp_path, arabic_file)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        return written
+    
+    async def process_file(self, english_file: Path) -> bool:
         """Process a single English file for translation"""
         arabic_file = self.get_arabic_file_path(english_file)
         
@@ -348,18 +519,24 @@ Arabic translation:"""
             self.stats["existing_translations"] += 1
             return True
         
+        rel_path = str(english_file.relative_to(self.content_root))
         try:
             # Read English content
             with open(english_file, 'r', encoding='utf-8') as f:
                 english_content = f.read()
             
-            logger.info(f"Translating: {english_file.relative_to(self.content_root)}")
+            logger.info(f"Translating: {rel_path}")
+            
+            if self.stream and not self.dry_run:
+                written = await self.write_arabic_streamed(english_content, rel_path, arabic_file)
+                logger.info(f"Created Arabic translation: {arabic_file} ({written:,} bytes)")
+                self.stats["created_translations"] += 1
+                if self.checkpoint is not None:
+                    self.checkpoint.mark_done(rel_path)
+                return True
             
             # Create Arabic translation
-            arabic_content = self.create_arabic_content(
-                english_content, 
-                str(english_file.relative_to(self.content_root))
-            )
+            arabic_content = await self.create_arabic_content(english_content, rel_path)
             
             if self.dry_run:
                 logger.info(f"[DRY RUN] Would create: {arabic_file}")
@@ -375,16 +552,23 @@ Arabic translation:"""
             
             logger.info(f"Created Arabic translation: {arabic_file}")
             self.stats["created_translations"] += 1
-            
-            # Small delay to avoid API rate limits
-            if self.openai_client:
-                time.sleep(0.5)
+            if self.checkpoint is not None:
+                self.checkpoint.mark_done(rel_path)
             
             return True
             
+        except TranslationError as e:
+            # Nothing is written: a rerun retries this file
+            logger.error(f"Translation failed for {rel_path}: {e}")
+            self.stats["errors"] += 1
+            if self.checkpoint is not None:
+                self.checkpoint.mark_failed(rel_path, str(e))
+            return False
         except Exception as e:
             logger.error(f"Error processing {english_file}: {e}")
             self.stats["errors"] += 1
+            if self.checkpoint is not None:
+                self.checkpoint.mark_failed(rel_path, str(e))
             return False
     
     def run_translation(self) -> Dict:
@@ -403,22 +587,70 @@ Arabic translation:"""
             logger.warning("No English files found to translate")
             return self.stats
         
-        # Process each file
-        for english_file in english_files:
-            try:
-                self.process_file(english_file)
-            except KeyboardInterrupt:
-                logger.info("Translation interrupted by user")
-                break
-            except Exception as e:
-                logger.error(f"Unexpected error processing {english_file}: {e}")
-                self.stats["errors"] += 1
+        if not self.dry_run:
+            self.checkpoint = TranslationCheckpoint(
+                self.docs_root,
+                {"target_lang": self.target_lang, "force": self.force, "tm_version": self.tm_version},
+                resume=self.resume,
+            )
+            pending = [f for f in english_files
+                       if not self.checkpoint.is_done(str(f.relative_to(self.content_root)))]
+            self.stats["resumed_files"] = len(english_files) - len(pending)
+            if self.stats["resumed_files"]:
+                logger.info(f"Resuming: {self.stats['resumed_files']} files already done "
+                            f"({len(self.checkpoint.failed)} failed last time will be retried)")
+            english_files = pending
+        
+        # Process files concurrently; pacing comes from the backend's rate limits
+        finished = False
+        try:
+            asyncio.run(self._process_files(english_files))
+            finished = True
+        except KeyboardInterrupt:
+            logger.info("Translation interrupted by user")
+        finally:
+            if self.checkpoint is not None:
+                if finished and not self.checkpoint.failed:
+                    self.checkpoint.clear()
+                else:
+                    self.checkpoint.save()
+                    logger.info(f"Progress saved to {self.checkpoint.path}; rerun to resume")
         
         # Generate report
         self.generate_report()
         
         return self.stats
     
+    async def _process_files(self, english_files: List[Path]) -> None:
+        """Feed files through a bounded queue to one shared, rate-limited backend"""
+        if self.api_key:
+            self.backend = AsyncTranslationBackend(
+                model=self.model,
+                temperature=self.temperature,
+                system_prompt=self.system_prompt,
+                concurrency=self.concurrency,
+                max_concurrency=self.max_concurrency,
+                rpm=self.rpm,
+                tpm=self.tpm,
+                base_url=self.base_url,
+                api_key=self.api_key,
+                cache=open_response_cache(self.docs_root, self.response_cache_mb),
+            )
+            if self.pack:
+                self.packer = SegmentPacker(self.backend, self._create_translation_prompt)
+        try:
+            # Enough workers to reach the ceiling; the backend's adaptive limit gates actual requests
+            await run_queue(english_files, self.process_file, workers=self.max_concurrency)
+        finally:
+            if self.backend is not None:
+                self.llm_stats = {**self.backend.stats, **self.backend.concurrency_stats,
+                                  **cache_report(self.backend.cache)}
+                if self.packer is not None:
+                    self.llm_stats.update(self.packer.stats)
+                    self.packer = None
+                await self.backend.aclose()
+                self.backend = None
+    
     def generate_report(self):
         """Generate a comprehensive translation report"""
         logger.info("\n" + "="*50)
@@ -428,7 +660,29 @@ Arabic translation:"""
         logger.info(f"Existing translations: {self.stats['existing_translations']}")
         logger.info(f"Missing translations: {self.stats['missing_translations']}")
         logger.info(f"Created translations: {self.stats['created_translations']}")
+        if self.stats['resumed_files']:
+            logger.info(f"Done in an earlier run: {self.stats['resumed_files']}")
         logger.info(f"Errors: {self.stats['errors']}")
+        if self.translation_memory is not None:
+            tm_stats = self.translation_memory.stats
+            logger.info(f"Translation memory hits: {tm_stats['hits']} ({self.translation_memory.hit_rate():.1f}%)")
+        if self.llm_stats:
+            logger.info(f"API requests: {self.llm_stats['requests']} "
+                        f"({self.llm_stats['prompt_tokens'] + self.llm_stats['completion_tokens']:,} tokens, "
+                        f"{self.llm_stats['errors']} failed)")
+            logger.info(f"Throttled responses: {self.llm_stats['throttled']} "
+                        f"(concurrency limit {self.llm_stats['concurrency_limit']}, "
+                        f"peak {self.llm_stats['peak_concurrency']})")
+            if self.llm_stats['breaker_trips']:
+                logger.info(f"Backend outages (circuit breaker trips): {self.llm_stats['breaker_trips']}")
+            if 'cache_hits' in self.llm_stats:
+                lookups = self.llm_stats['cache_hits'] + self.llm_stats['cache_misses']
+                hit_rate = self.llm_stats['cache_hits'] / lookups * 100 if lookups else 0.0
+                logger.info(f"Response cache hits: {self.llm_stats['cache_hits']} ({hit_rate:.1f}%)")
+            if self.pack:
+                logger.info(f"Packed requests: {self.llm_stats['packed_requests']} "
+                            f"({self.llm_stats['packed_segments']} segments, "
+                            f"{self.llm_stats['pack_fallbacks']} re-sent individually)")
         
         completion_rate = 0
         if self.stats['total_files'] > 0:
@@ -447,8 +701,17 @@ Arabic translation:"""
                 "docs_root": str(self.docs_root),
                 "target_lang": self.target_lang,
                 "dry_run": self.dry_run,
-                "force": self.force
-            }
+                "force": self.force,
+                "concurrency": self.concurrency,
+                "max_concurrency": self.max_concurrency,
+                "chunk_tokens": self.chunk_tokens,
+                "pack": self.pack,
+                "response_cache_mb": self.response_cache_mb,
+                "stream": self.stream,
+                "rpm": self.rpm,
+                "tpm": self.tpm
+            },
+            "api": self.llm_stats
         }
         
         with open(report_file, 'w', encoding='utf-8') as f:
@@ -494,6 +757,72 @@ Examples:
         help='Overwrite existing translations'
     )
     
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f'Initial API requests in flight; adapts to throttling (default: {DEFAULT_CONCURRENCY})'
+    )
+    
+    parser.add_argument(
+        '--max-concurrency',
+        type=int,
+        default=DEFAULT_MAX_CONCURRENCY,
+        help=f'Ceiling for the adaptive in-flight limit (default: {DEFAULT_MAX_CONCURRENCY})'
+    )
+    
+    parser.add_argument(
+        '--chunk-tokens',
+        type=int,
+        default=DEFAULT_CHUNK_TOKENS,
+        help=f'Approximate token budget per translation request for long pages (default: {DEFAULT_CHUNK_TOKENS})'
+    )
+    
+    parser.add_argument(
+        '--pack',
+        action='store_true',
+        help='Pack short segments and frontmatter fields from several files into one request'
+    )
+    
+    parser.add_argument(
+        '--response-cache-mb',
+        type=int,
+        default=DEFAULT_CACHE_MB,
+        help=f'Size limit of the on-disk API response cache in MB, 0 to disable (default: {DEFAULT_CACHE_MB})'
+    )
+    
+    parser.add_argument(
+        '--no-resume',
+        action='store_true',
+        help='Ignore the checkpoint of an interrupted run and start over'
+    )
+    
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Stream API responses and write each page as it is translated (progress with --verbose)'
+    )
+    
+    parser.add_argument(
+        '--rpm',
+        type=int,
+        default=DEFAULT_RPM,
+        help=f'API requests per minute limit (default: {DEFAULT_RPM})'
+    )
+    
+    parser.add_argument(
+        '--tpm',
+        type=int,
+        default=DEFAULT_TPM,
+        help=f'API tokens per minute limit (default: {DEFAULT_TPM})'
+    )
+    
+    parser.add_argument(
+        '--base-url',
+        help='OpenAI-compatible API base URL, e.g. a local mock server; OPENAI_API_KEY is optional with it '
+             '(default: OPENAI_BASE_URL or api.openai.com)'
+    )
+    
     parser.add_argument(
         '--verbose',
         action='store_true',
@@ -519,9 +848,9 @@ Examples:
             return 1
     
     # Check for OpenAI API key
-    if not args.dry_run and not os.getenv('OPENAI_API_KEY'):
+    if not args.dry_run and not resolve_api_key(args.base_url):
         print("Warning: OPENAI_API_KEY environment variable not set")
-        print("Set it with: export OPENAI_API_KEY='your-api-key'")
+        print("Set it with: export OPENAI_API_KEY='your-api-key' (not needed with --base-url)")
         if not HAS_OPENAI:
             return 1
     
@@ -530,7 +859,18 @@ Examples:
         docs_root=args.docs_root,
         target_lang=args.target_lang,
         dry_run=args.dry_run,
-        force=args.force
+        force=args.force,
+        concurrency=args.concurrency,
+        rpm=args.rpm,
+        tpm=args.tpm,
+        base_url=args.base_url,
+        max_concurrency=args.max_concurrency,
+        chunk_tokens=args.chunk_tokens,
+        pack=args.pack,
+        response_cache_mb=args.response_cache_mb,
+        resume=not args.no_resume,
+        stream=args.stream,
+        progress=log_progress if args.stream else None
     )
     
     try:
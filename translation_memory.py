@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Persistent Translation Memory
+
+SQLite-backed store mapping normalized English segments to their Arabic
+output, tagged with the engine and engine/glossary version that produced
+them. Shared by the local engine and the OpenAI-backed translators so that
+reruns, --all passes after a small glossary change, and crash recovery skip
+every segment that was already translated with the same version.
+
+Usage:
+    from translation_memory import open_translation_memory
+
+    tm = open_translation_memory(docs_root / ".translation_memory.sqlite3")
+    cached = tm.lookup("local", version, segment)
+    if cached is None:
+        tm.store("local", version, segment, translate(segment))
+"""
+
+import os
+import re
+import time
+import atexit
+import sqlite3
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FILENAME = ".translation_memory.sqlite3"
+
+_INLINE_WS = re.compile(r"[ \t]+")
+
+
+def normalize_segment(text: str) -> str:
+    """Cache key text for a segment.
+
+    Single-line segments collapse runs of spaces/tabs; multi-line chunks
+    (code blocks, nested lists, YAML) keep their exact layout so chunks that
+    differ only in indentation never share a key. Outer whitespace is
+    dropped either way.
+    """
+    stripped = text.strip()
+    if "\n" in stripped:
+        return stripped
+    return _INLINE_WS.sub(" ", stripped)
+
+
+def _split_outer_whitespace(text: str) -> Tuple[str, str]:
+    stripped = text.strip()
+    if not stripped:
+        return text, ""
+    start = text.index(stripped[0])
+    return text[:start], text[start + len(stripped):]
+
+
+class TranslationMemory:
+    """Durable segment → translation store safe to share across processes.
+
+    Writes are buffered and committed in batches (or immediately with
+    durable=True); lookups see pending writes. Connections are reopened
+    transparently after a fork so pool workers can share one file.
+    """
+
+    def __init__(self, path, batch_size: int = 500, flush_interval: float = 5.0):
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.stats = {"hits": 0, "misses": 0, "stored": 0}
+        self._pending: Dict[Tuple[str, str], Tuple[str, str, str, float]] = {}
+        self._last_flush = time.monotonic()
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS segments (
+                    engine TEXT NOT NULL,
+                    source_hash TEXT NOT NULL,
+                    version TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    target TEXT NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (engine, source_hash)
+                )"""
+            )
+            conn.commit()
+            self._conn = conn
+            self._pid = os.getpid()
+            # Buffered writes belong to the process that made them
+            self._pending.clear()
+        return self._conn
+
+    @staticmethod
+    def _hash(normalized: str) -> str:
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    def lookup(self, engine: str, version: str, source: str) -> Optional[str]:
+        """Return the stored translation for source, or None if absent or stale."""
+        normalized = normalize_segment(source)
+        if not normalized:
+            return None
+        key = (engine, self._hash(normalized))
+        with self._lock:
+            conn = self._connection()
+            pending = self._pending.get(key)
+            if pending is not None:
+                row = (pending[0], pending[2])
+            else:
+                row = conn.execute(
+                    "SELECT version, target FROM segments WHERE engine = ? AND source_hash = ?", key
+                ).fetchone()
+        if row is None or row[0] != version:
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        leading, trailing = _split_outer_whitespace(source)
+        return leading + row[1] + trailing
+
+    def store(self, engine: str, version: str, source: str, target: str, durable: bool = False) -> None:
+        """Record a translation; durable=True commits before returning."""
+        normalized = normalize_segment(source)
+        if not normalized:
+            return
+        key = (engine, self._hash(normalized))
+        with self._lock:
+            self._connection()
+            self._pending[key] = (version, normalized, target.strip(), time.time())
+            self.stats["stored"] += 1
+            if (durable or len(self._pending) >= self.batch_size
+                    or time.monotonic() - self._last_flush >= self.flush_interval):
+                self.flush()
+
+    def flush(self) -> None:
+        """Commit all buffered writes."""
+        with self._lock:
+            if not self._pending:
+                return
+            conn = self._connection()
+            rows: List[Tuple] = [
+                (engine, source_hash, version, normalized, target, updated_at)
+                for (engine, source_hash), (version, normalized, target, updated_at) in self._pending.items()
+            ]
+            try:
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO segments "
+                        "(engine, source_hash, version, source, target, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                        rows,
+                    )
+                self._pending.clear()
+            except sqlite3.Error as e:
+                logger.warning(f"Translation memory flush failed ({self.path}): {e}")
+            self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        with self._lock:
+            self.flush()
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+
+    def hit_rate(self) -> float:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return (self.stats["hits"] / lookups * 100) if lookups else 0.0
+
+
+_OPEN_MEMORIES: Dict[str, TranslationMemory] = {}
+_OPEN_LOCK = threading.Lock()
+
+
+def open_translation_memory(path) -> Optional[TranslationMemory]:
+    """Return the process-wide TranslationMemory for path, or None if unusable.
+
+    The parent directory must already exist; a missing docs root simply
+    disables the memory instead of failing the caller.
+    """
+    path = Path(path).resolve()
+    if not path.parent.is_dir():
+        return None
+    with _OPEN_LOCK:
+        tm = _OPEN_MEMORIES.get(str(path))
+        if tm is None:
+            try:
+                tm = TranslationMemory(path)
+                tm._connection()
+            except sqlite3.Error as e:
+                logger.warning(f"Translation memory disabled ({path}): {e}")
+                return None
+            _OPEN_MEMORIES[str(path)] = tm
+        return tm
+
+
+@atexit.register
+def _flush_open_memories() -> None:
+    for tm in list(_OPEN_MEMORIES.values()):
+        try:
+            tm.flush()
+        except Exception:
+            pass
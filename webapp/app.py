@@ -23,7 +23,9 @@ import sys
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
+from arabic_postprocess import ArabicPostProcessor
 from local_ai_translator import LocalAITranslator
+from script_histogram import likely_english
 
 
 app = FastAPI(title="Docs AI Translator")
@@ -44,72 +46,20 @@ SESSION_STORE = {}
 # Background job state for universal file translation
 JOBS = {}
 
+# Paragraphs translated per batch in ingest jobs (progress is reported per batch)
+INGEST_BATCH_SIZE = 200
 
-def _strip_non_prose(text: str) -> str:
-    text = re.sub(r"```[\s\S]*?```", "", text, flags=re.MULTILINE)
-    text = re.sub(r"`[^`]+`", "", text)
-    text = re.sub(r"({%[^%]*%}|{{[^}]*}})", "", text)
-    text = re.sub(r"https?://[^\s)]+", "", text)
-    return text
+# Longest ingest segment; longer paragraphs are cut at line, then sentence, boundaries
+INGEST_MAX_SEGMENT_CHARS = 10000
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?؟])(\s+)")
 
 
-def _arabic_ratio(text: str) -> float:
-    letters = re.findall(r"[A-Za-z\u0600-\u06FF]", text)
-    if not letters:
-        return 1.0
-    arabic = re.findall(r"[\u0600-\u06FF]", text)
-    return len(arabic) / len(letters)
+# Section cues that mark an untranslated page in uploaded output
+_ENGLISH_CUES = re.compile(r"\b(Prerequisites|Overview|Summary|Steps|Note:|Tip:|Caution:|Warning:)\b")
 
 
 def _likely_english(text: str) -> bool:
-    cleaned = _strip_non_prose(text)
-    ratio = _arabic_ratio(cleaned)
-    ascii_letters = len(re.findall(r"[A-Za-z]", cleaned))
-    if re.search(r"\b(Prerequisites|Overview|Summary|Steps|Note:|Tip:|Caution:|Warning:)\b", cleaned) and ratio < 0.5:
-        return True
-    return ascii_letters > 150 and ratio < 0.15
-
-
-def _arabic_only_cleanup(text: str) -> str:
-    text = re.sub(r"```[\s\S]*?```", "\n", text, flags=re.MULTILINE)
-    text = re.sub(r"`[^`]*`", " ", text)
-    text = re.sub(r"({%[^%]*%}|{{[^}]*}})", " ", text)
-    text = re.sub(r"https?://\S+|www\.\S+", " ", text)
-    text = re.sub(r"\b[\w\.-]+@[\w\.-]+\.[A-Za-z]{2,}\b", " ", text)
-    text = re.sub(r"<[^>]+>", " ", text)
-    # Remove Latin letters (keep digits/punct)
-    text = re.sub(r"[A-Za-z]", "", text)
-    # Remove empty bracket pairs
-    text = re.sub(r"\(\s*\)", " ", text)
-    text = re.sub(r"\[\s*\]", " ", text)
-    text = re.sub(r"\{\s*\}", " ", text)
-    # Normalize whitespace
-    text = re.sub(r"[ \t]+", " ", text)
-    # Keep only lines containing Arabic
-    kept = []
-    for line in text.splitlines():
-        if re.search(r"[\u0600-\u06FF]", line):
-            kept.append(line.strip())
-    text = "\n".join(kept)
-    text = re.sub(r"(\n\s*){3,}", "\n\n", text)
-    text = _arabic_typography(text)
-    return text.strip()
-
-
-def _arabic_typography(text: str, convert_digits: bool = True) -> str:
-    # Convert Western digits to Arabic-Indic
-    if convert_digits:
-        text = text.translate(str.maketrans("0123456789", "٠١٢٣٤٥٦٧٨٩"))
-    # Punctuation replacements
-    text = text.replace(",", "،").replace(";", "؛")
-    # Replace question marks only when adjacent to Arabic letters
-    text = re.sub(r"(?<=\w)\?", "؟", text)
-    # Remove space before punctuation and ensure single space after where appropriate
-    text = re.sub(r"\s+([،؛:])", r"\1", text)
-    text = re.sub(r"([،؛:])([^\s\n])", r"\1 \2", text)
-    # Collapse multiple spaces
-    text = re.sub(r"[ \t]+", " ", text)
-    return text
+    return likely_english(text, cues=_ENGLISH_CUES)
 
 
 def _strip_html(html: str) -> str:
@@ -255,6 +205,43 @@ def _extract_text_generic(path: Path, pdf_mode: str = "auto") -> str:
         return raw.decode("latin-1", errors="ignore")
 
 
+def _split_segment(paragraph: str, limit: int = INGEST_MAX_SEGMENT_CHARS) -> List[Tuple[str, str]]:
+    """Cut a paragraph into (piece, separator) pairs of at most ~limit characters
+
+    Pieces end at line breaks where possible, else at sentence ends, and only
+    as a last resort mid-sentence; joining piece + separator restores the
+    paragraph exactly.
+    """
+    if len(paragraph) <= limit:
+        return [(paragraph, "")]
+    units: List[Tuple[str, str]] = []
+    lines = paragraph.split("\n")
+    for i, line in enumerate(lines):
+        line_sep = "\n" if i < len(lines) - 1 else ""
+        if len(line) <= limit:
+            units.append((line, line_sep))
+            continue
+        parts = _SENTENCE_BREAK.split(line)
+        for j in range(0, len(parts), 2):
+            sentence = parts[j]
+            sep = parts[j + 1] if j + 1 < len(parts) else line_sep
+            for k in range(0, max(1, len(sentence)), limit):
+                units.append((sentence[k:k + limit], sep if k + limit >= len(sentence) else ""))
+
+    # Greedily merge neighbouring units back up to the limit
+    pieces: List[Tuple[str, str]] = []
+    current, current_sep = units[0]
+    for text, sep in units[1:]:
+        if len(current) + len(current_sep) + len(text) <= limit:
+            current += current_sep + text
+        else:
+            pieces.append((current, current_sep))
+            current = text
+        current_sep = sep
+    pieces.append((current, current_sep))
+    return pieces
+
+
 async def _process_file_job(session_id: str, src_path: Path, aggressive: bool, desired_format: str, pdf_mode: str = "auto", arabic_only: bool = False):
     JOBS[session_id] = {
         "status": "processing",
@@ -267,21 +254,23 @@ async def _process_file_job(session_id: str, src_path: Path, aggressive: bool, d
     try:
         text = _extract_text_generic(src_path, pdf_mode=pdf_mode)
         translator = LocalAITranslator(docs_root=str(ROOT / "docs"), aggressive=aggressive, arabic_only=arabic_only)
-        total = max(1, (len(text) // 10000) + 1)
+        # Translate paragraph by paragraph (long ones in capped pieces), deduplicating within each batch
+        paragraphs = text.split("\n\n")
+        pieces: List[Tuple[str, str]] = []
+        for i, paragraph in enumerate(paragraphs):
+            split = _split_segment(paragraph)
+            if i < len(paragraphs) - 1:
+                split[-1] = (split[-1][0], split[-1][1] + "\n\n")
+            pieces.extend(split)
+        segments = [piece for piece, _ in pieces]
         out_parts: List[str] = []
-        for idx in range(total):
-            start = idx * 10000
-            chunk = text[start:start + 10000]
-            if not chunk:
-                break
-            enhanced = translator.translate_text_intelligent(chunk)
-            out_parts.append(enhanced)
-            JOBS[session_id]["progress"] = int(((idx + 1) / total) * 100)
+        for start in range(0, len(segments), INGEST_BATCH_SIZE):
+            out_parts.extend(translator.translate_batch(segments[start:start + INGEST_BATCH_SIZE]))
+            JOBS[session_id]["progress"] = int(len(out_parts) / len(segments) * 100)
             await asyncio.sleep(0)  # yield
 
-        output_text = "\n\n".join(out_parts)
-        if arabic_only:
-            output_text = _arabic_only_cleanup(output_text)
+        output_text = ArabicPostProcessor(arabic_only=arabic_only).process(
+            "".join(translated + sep for translated, (_, sep) in zip(out_parts, pieces)))
 
         # Wrap as Markdown frontmatter if requested
         sess_dir = src_path.parent
@@ -320,7 +309,7 @@ async def translate_file(file: UploadFile = File(...), aggressive: bool = Form(F
     translator = LocalAITranslator(docs_root=str(ROOT / "docs"), aggressive=aggressive)
     front, body = translator.extract_frontmatter(content)
     enhanced_front = translator.enhance_frontmatter(front)
-    output_md = translator.generate_enhanced_content(body, enhanced_front)
+    output_md = "".join(translator.postprocess_stream(translator.iter_enhanced_content(body, enhanced_front)))
 
     return JSONResponse({
         "filename": file.filename,
@@ -357,9 +346,10 @@ async def translate_archive(file: UploadFile = File(...), aggressive: bool = For
             txt = p.read_text(encoding="utf-8", errors="ignore")
             front, body = translator.extract_frontmatter(txt)
             enhanced_front = translator.enhance_frontmatter(front)
-            output_md = translator.generate_enhanced_content(body, enhanced_front)
             out_path = p.with_name(p.stem + "-ar.md")
-            out_path.write_text(output_md, encoding="utf-8")
+            # Stream sections straight to disk instead of building the page in memory
+            with out_path.open("w", encoding="utf-8") as out:
+                out.writelines(translator.postprocess_stream(translator.iter_enhanced_content(body, enhanced_front)))
             produced.append(out_path)
         except Exception:
             continue